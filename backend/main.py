@@ -1,6 +1,8 @@
 #!/usr/bin/env python3
 """Main entry point for SVTVision backend."""
 
+import json
+import os
 import sys
 from pathlib import Path
 import uvicorn
@@ -8,7 +10,21 @@ import uvicorn
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent / "src"))
 
-from plana.app_orchestrator import AppOrchestrator
+
+def _apply_openmp_env(config_dir: Path) -> None:
+    """Export OpenMP settings from config/app.json ("omp_threads") before cv2 is first imported.
+    
+    libgomp reads OMP_* once at load and applies them to every thread, including the capture and
+    consumer threads. Values already set in the environment win; no key means OpenMP defaults.
+    """
+    try:
+        with open(config_dir / "app.json", "r") as f:
+            omp_threads = json.load(f).get("omp_threads")
+    except (OSError, ValueError):
+        return
+    if omp_threads:
+        os.environ.setdefault("OMP_NUM_THREADS", str(int(omp_threads)))
+        os.environ.setdefault("OMP_DYNAMIC", "FALSE")
 
 
 def main():
@@ -18,6 +34,10 @@ def main():
     config_dir = project_root / "config"
     frontend_dist = project_root / "frontend" / "dist"
     
+    # Must run before plana (and with it cv2) is imported
+    _apply_openmp_env(config_dir)
+    from plana.app_orchestrator import AppOrchestrator
+    
     # Create orchestrator
     orchestrator = AppOrchestrator(config_dir, frontend_dist)
     
@@ -1,46 +1,102 @@
 """
 GPU-accelerated frame-to-JPEG encoding for streaming.
-Uses nvJPEG when available (pynvjpeg), otherwise falls back to CPU cv2.imencode.
+Uses nvJPEG when available (pynvjpeg), otherwise CPU: libjpeg-turbo via PyTurboJPEG when
+installed (pip install PyTurboJPEG; needs libturbojpeg), else cv2.imencode.
 """
 
 import sys
-from typing import Optional
+import threading
+from concurrent.futures import Executor
+from typing import Dict, List, Optional, Sequence, Tuple
 import numpy as np
 
-# Lazy singleton for GPU encoder (nvJPEG); None = not tried yet, False = unavailable, else encoder instance
-_nvjpeg_encoder: Optional[object] = None
+# nvJPEG availability: None = not tried yet, False = unavailable, True = available.
+# Encoder handles are created per thread (nvJPEG state is not safe to share between the
+# consumer thread and web/pipeline threads encoding lazily at the same time).
+_nvjpeg_available: Optional[bool] = None
+_thread_state = threading.local()
 
+# PyTurboJPEG: None = not tried yet, False = unavailable, else (TurboJPEG, TJPF_BGR, TJPF_GRAY,
+# TJSAMP_420, TJSAMP_GRAY). Its encode() opens a compressor handle per call, so one instance is shared.
+_turbojpeg: Optional[object] = None
 
-def _init_gpu_encoder() -> Optional[object]:
-    """Try to create nvJPEG encoder. Returns encoder instance or None."""
-    global _nvjpeg_encoder
-    if _nvjpeg_encoder is not None:
-        return _nvjpeg_encoder if _nvjpeg_encoder is not False else None
+# cv2.imencode params per quality, built once instead of a new list every frame
+_JPEG_PARAMS: Dict[int, Tuple[int, int]] = {}
+
+
+def _create_nvjpeg_encoder() -> Optional[object]:
+    """Create an nvJPEG encoder instance, or None if pynvjpeg is not usable."""
     try:
         from nvjpeg import NvJpeg
-        _nvjpeg_encoder = NvJpeg()
-        print("[GPU] Video frame→stream encoding: nvJPEG (GPU)", file=sys.stderr)
-        return _nvjpeg_encoder
+        return NvJpeg()
     except Exception:
         try:
             import nvjpeg
-            _nvjpeg_encoder = nvjpeg.NvJpeg() if hasattr(nvjpeg, 'NvJpeg') else None
-            if _nvjpeg_encoder is not None:
-                print("[GPU] Video frame→stream encoding: nvJPEG (GPU)", file=sys.stderr)
-            return _nvjpeg_encoder
+            return nvjpeg.NvJpeg() if hasattr(nvjpeg, 'NvJpeg') else None
         except Exception:
-            pass
-        _nvjpeg_encoder = False
+            return None
+
+
+def _init_gpu_encoder() -> Optional[object]:
+    """Return this thread's nvJPEG encoder (created on first use), or None if unavailable."""
+    global _nvjpeg_available
+    if _nvjpeg_available is False:
         return None
+    encoder = getattr(_thread_state, 'encoder', None)
+    if encoder is None:
+        encoder = _create_nvjpeg_encoder() or False
+        _thread_state.encoder = encoder
+        if _nvjpeg_available is None:
+            _nvjpeg_available = encoder is not False
+            if _nvjpeg_available:
+                print("[GPU] Video frame→stream encoding: nvJPEG (GPU)", file=sys.stderr)
+    return encoder if encoder is not False else None
+
+
+def _init_turbojpeg() -> Optional[tuple]:
+    """Try to load PyTurboJPEG. Returns (encoder, TJPF_BGR, TJPF_GRAY, TJSAMP_420, TJSAMP_GRAY) or None."""
+    global _turbojpeg
+    if _turbojpeg is None:
+        try:
+            from turbojpeg import TurboJPEG, TJPF_BGR, TJPF_GRAY, TJSAMP_420, TJSAMP_GRAY
+            _turbojpeg = (TurboJPEG(), TJPF_BGR, TJPF_GRAY, TJSAMP_420, TJSAMP_GRAY)
+            print("[JPEG] Video frame→stream encoding (CPU): libjpeg-turbo", file=sys.stderr)
+        except Exception:
+            _turbojpeg = False
+    return _turbojpeg or None
+
+
+def encode_frame_to_jpeg(frame: np.ndarray, quality: int = 85, grayscale: bool = False) -> bytes:
+    """
+    Encode a BGR frame (H, W, 3) or grayscale frame (H, W) to JPEG bytes for streaming.
+    Uses GPU (nvJPEG) for BGR when available, otherwise CPU (cv2.imencode).
+    Grayscale frames are written as single-channel JPEGs; grayscale=True does the same for a BGR frame.
+    """
+    return _encode_with(_init_gpu_encoder(), frame, quality, grayscale)
 
 
-def encode_frame_to_jpeg(frame: np.ndarray, quality: int = 85) -> bytes:
+def encode_frames_to_jpeg(frames: List[np.ndarray], quality: int = 85,
+                          grayscale: Optional[Sequence[bool]] = None,
+                          executor: Optional[Executor] = None) -> List[bytes]:
     """
-    Encode a BGR frame (H, W, 3) to JPEG bytes for streaming.
-    Uses GPU (nvJPEG) when available, otherwise CPU (cv2.imencode).
+    Encode several frames (e.g. one per camera) to JPEG bytes in one call.
+    The encoder is resolved once for the whole batch; results are in input order.
+    grayscale, if given, holds one flag per frame (see encode_frame_to_jpeg).
+    With an executor, frames are encoded in parallel (the native encoders release the GIL);
+    each worker thread uses its own nvJPEG handle.
     """
+    if grayscale is None:
+        grayscale = [False] * len(frames)
+    if executor is not None and len(frames) > 1:
+        return list(executor.map(encode_frame_to_jpeg, frames, [quality] * len(frames), grayscale))
     encoder = _init_gpu_encoder()
-    if encoder is not None and hasattr(encoder, 'encode'):
+    return [_encode_with(encoder, frame, quality, gray) for frame, gray in zip(frames, grayscale)]
+
+
+def _encode_with(encoder: Optional[object], frame: np.ndarray, quality: int, grayscale: bool = False) -> bytes:
+    """Encode one frame with the given nvJPEG encoder (or None), falling back to CPU encoders."""
+    to_gray = grayscale and frame.ndim == 3
+    if encoder is not None and frame.ndim == 3 and not to_gray and hasattr(encoder, 'encode'):
         try:
             # pynvjpeg: encode(img) or encode(img, quality); OpenCV frames are BGR (nvJPEG accepts BGR)
             out = encoder.encode(frame, quality)
@@ -48,12 +104,35 @@ def encode_frame_to_jpeg(frame: np.ndarray, quality: int = 85) -> bytes:
                 return bytes(out)
         except Exception:
             pass
+    # CPU: libjpeg-turbo when available (native BGR or single-channel input, no conversion pass).
+    # BGR -> gray JPEG is fused: TJSAMP_GRAY keeps only the luma plane computed during compression.
+    turbo = _init_turbojpeg()
+    if turbo is not None:
+        tj, tjpf_bgr, tjpf_gray, tjsamp_420, tjsamp_gray = turbo
+        try:
+            if frame.ndim == 2:
+                return tj.encode(np.ascontiguousarray(frame), quality=quality,
+                                 pixel_format=tjpf_gray, jpeg_subsample=tjsamp_gray)
+            return tj.encode(np.ascontiguousarray(frame), quality=quality,
+                             pixel_format=tjpf_bgr, jpeg_subsample=tjsamp_gray if to_gray else tjsamp_420)
+        except Exception:
+            pass
     # CPU fallback
     import cv2
-    _, buf = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, quality])
+    if to_gray:
+        frame = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+    params = _JPEG_PARAMS.get(quality)
+    if params is None:
+        params = _JPEG_PARAMS[quality] = (cv2.IMWRITE_JPEG_QUALITY, quality)
+    _, buf = cv2.imencode('.jpg', frame, params)
     return buf.tobytes() if buf is not None else b''
 
 
+def is_fused_gray_encoding_available() -> bool:
+    """Return True if BGR frames can be encoded straight to grayscale JPEG (libjpeg-turbo)."""
+    return _init_turbojpeg() is not None
+
+
 def is_gpu_encoding_available() -> bool:
     """Return True if GPU (nvJPEG) encoding will be used."""
     return _init_gpu_encoder() is not None
@@ -4,6 +4,7 @@ import cv2
 import numpy as np
 from typing import Optional
 from ..ports.camera_port import CameraPort
+from .gpu_frame_encoder import encode_frame_to_jpeg
 from ..services.logging_service import LoggingService
 
 
@@ -18,6 +19,8 @@ class OpenCVCameraAdapter(CameraPort):
         self.height: int = 0
         self.fps: float = 0.0
         self.format: str = ''
+        # GREY opened with CONVERT_RGB off: frames arrive as raw Y8 and are reshaped, not expanded to BGR
+        self._raw_grey = False
     
     def open(self, device_path: str, width: int, height: int, fps: float, format: str) -> bool:
         """Open camera device."""
@@ -43,12 +46,7 @@ class OpenCVCameraAdapter(CameraPort):
             self.cap.set(cv2.CAP_PROP_FPS, fps)
             
             # Set format. Phase 1: GREY = Y-only (grayscale) for apriltag use_case.
-            if format == 'MJPG':
-                self.cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*'MJPG'))
-            elif format == 'YUYV':
-                self.cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*'YUYV'))
-            elif format == 'GREY':
-                self.cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*'GREY'))
+            self._set_format(format)
             
             # Verify actual settings
             actual_width = int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH))
@@ -74,6 +72,30 @@ class OpenCVCameraAdapter(CameraPort):
                 self.cap = None
             return False
     
+    def _set_format(self, format: str) -> None:
+        """Set the capture FOURCC; GREY also turns off OpenCV's conversion to 3-channel BGR."""
+        if format == 'MJPG':
+            self.cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*'MJPG'))
+        elif format == 'YUYV':
+            self.cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*'YUYV'))
+        elif format == 'GREY':
+            self.cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*'GREY'))
+        raw_grey = format == 'GREY' and bool(self.cap.set(cv2.CAP_PROP_CONVERT_RGB, 0))
+        if self._raw_grey and not raw_grey:
+            self.cap.set(cv2.CAP_PROP_CONVERT_RGB, 1)
+        self._raw_grey = raw_grey
+    
+    def _grey_from_raw(self, frame: np.ndarray) -> Optional[np.ndarray]:
+        """Shape a raw Y8 buffer (OpenCV returns it as one row) into an (H, W) image."""
+        if frame.ndim == 2 and frame.shape == (self.height, self.width):
+            return frame
+        if frame.size == self.width * self.height:
+            return frame.reshape(self.height, self.width)
+        if self.height > 0 and frame.size % self.height == 0 and frame.size // self.height > self.width:
+            # Row stride padding: drop the padding bytes at the end of each row
+            return frame.reshape(self.height, -1)[:, :self.width]
+        return None
+    
     def close(self) -> None:
         """Close camera device."""
         if self.cap:
@@ -96,18 +118,16 @@ class OpenCVCameraAdapter(CameraPort):
             return None
         
         try:
-            ret, frame = self.cap.read()
-            if not ret or frame is None:
+            frame = self.capture_frame_raw()
+            if frame is None:
                 return None
             
             # Convert to grayscale if requested
-            if grayscale:
+            if grayscale and frame.ndim == 3:
+                # Encoded as a single-channel JPEG
                 frame = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-                # Convert grayscale to BGR format for JPEG encoding (same result but ensures 3 channels)
-                frame = cv2.cvtColor(frame, cv2.COLOR_GRAY2BGR)
             
             # Encode as JPEG (GPU when available)
-            from .gpu_frame_encoder import encode_frame_to_jpeg
             jpeg_bytes = encode_frame_to_jpeg(frame, quality=85)
             if not jpeg_bytes:
                 return None
@@ -117,25 +137,48 @@ class OpenCVCameraAdapter(CameraPort):
             self.logger.debug(f"[Camera] Error capturing frame: {e}")
             return None
     
-    def capture_frame_raw(self) -> Optional[np.ndarray]:
+    def capture_frame_raw(self, out: Optional[np.ndarray] = None) -> Optional[np.ndarray]:
         """Capture a single raw frame as numpy array.
         
+        Args:
+            out: Optional preallocated BGR buffer; OpenCV decodes into it when shape/dtype match
+                 (otherwise, and for raw GREY, a new array is returned)
+        
         Returns:
-            Raw frame data as numpy array (BGR format), or None if capture failed
+            Raw frame data as numpy array (BGR format; (H, W) grayscale when opened as GREY),
+            or None if capture failed
         """
         if not self.is_open():
             return None
         
         try:
-            ret, frame = self.cap.read()
+            if out is not None and not self._raw_grey:
+                ret, frame = self.cap.read(out)
+            else:
+                ret, frame = self.cap.read()
             if not ret or frame is None:
                 return None
+            if self._raw_grey:
+                grey = self._grey_from_raw(frame)
+                if grey is None:
+                    # Unexpected raw layout: let OpenCV convert again from the next frame on
+                    self.logger.warning(
+                        f"[Camera] Raw GREY frame of {frame.size} bytes does not fit {self.width}x{self.height}; "
+                        "falling back to OpenCV conversion"
+                    )
+                    self.cap.set(cv2.CAP_PROP_CONVERT_RGB, 1)
+                    self._raw_grey = False
+                return grey
             return frame
             
         except Exception as e:
             self.logger.debug(f"[Camera] Error capturing raw frame: {e}")
             return None
     
+    def is_raw_grey(self) -> bool:
+        """Check if the camera is opened as raw GREY (Y8 frames, no OpenCV conversion)."""
+        return self._raw_grey
+    
     def get_actual_settings(self) -> dict:
         """Get actual camera settings."""
         if not self.is_open():
@@ -165,12 +208,7 @@ class OpenCVCameraAdapter(CameraPort):
             self.cap.set(cv2.CAP_PROP_FPS, fps)
             
             # Set format
-            if format == 'MJPG':
-                self.cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*'MJPG'))
-            elif format == 'YUYV':
-                self.cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*'YUYV'))
-            elif format == 'GREY':
-                self.cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*'GREY'))
+            self._set_format(format)
             
             # Update stored values
             actual_settings = self.get_actual_settings()
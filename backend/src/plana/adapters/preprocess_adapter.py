@@ -25,6 +25,11 @@ class PreprocessAdapter(PreprocessPort):
             "morphology": False,  # Disabled - can remove tag features
             "morph_kernel_size": 3
         }
+        # Scratch buffers for intermediates that never leave preprocess() (blur, threshold before
+        # morphology), reused across frames; the returned image is always freshly allocated.
+        self._blur_buf: Optional[np.ndarray] = None
+        self._threshold_buf: Optional[np.ndarray] = None
+        self._morph_kernels: Dict[int, np.ndarray] = {}
         self.logger.info("[Preprocess] PreprocessAdapter initialized")
     
     def preprocess(self, frame: np.ndarray) -> Optional[np.ndarray]:
@@ -37,19 +42,28 @@ class PreprocessAdapter(PreprocessPort):
         4. Apply morphology operations (optional)
         """
         try:
-            # Convert to grayscale if needed
+            # Convert to grayscale if needed (gray input is only read, so no copy)
             if len(frame.shape) == 3:
                 gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
             else:
-                gray = frame.copy()
+                gray = frame
             
-            # Apply Gaussian blur
+            # Apply Gaussian blur (intermediate: scratch buffer)
             blur_size = self.config["blur_kernel_size"]
             if blur_size > 0 and blur_size % 2 == 1:
-                blurred = cv2.GaussianBlur(gray, (blur_size, blur_size), 0)
+                self._blur_buf = self._scratch(self._blur_buf, gray.shape)
+                blurred = cv2.GaussianBlur(gray, (blur_size, blur_size), 0, dst=self._blur_buf)
             else:
                 blurred = gray
             
+            # Threshold output is the result unless morphology follows, in which case it is scratch
+            morphology = self.config["morphology"]
+            if morphology:
+                self._threshold_buf = self._scratch(self._threshold_buf, gray.shape)
+                threshold_dst = self._threshold_buf
+            else:
+                threshold_dst = None
+            
             # Apply threshold (adaptive if option on, else binary)
             use_adaptive = self.config.get("adaptive_thresholding", self.config.get("threshold_type") == "adaptive")
             if use_adaptive:
@@ -60,7 +74,8 @@ class PreprocessAdapter(PreprocessPort):
                     self.config["adaptive_method"],
                     self.config["adaptive_threshold_type"],
                     self.config["adaptive_block_size"],
-                    self.config["adaptive_c"]
+                    self.config["adaptive_c"],
+                    dst=threshold_dst
                 )
             else:
                 # Binary threshold
@@ -68,15 +83,20 @@ class PreprocessAdapter(PreprocessPort):
                     blurred,
                     self.config["binary_threshold"],
                     255,
-                    cv2.THRESH_BINARY
+                    cv2.THRESH_BINARY,
+                    dst=threshold_dst
                 )
             
             # Apply morphology operations (opening and closing)
-            if self.config["morphology"]:
+            if morphology:
                 kernel_size = self.config["morph_kernel_size"]
-                kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (kernel_size, kernel_size))
+                kernel = self._morph_kernels.get(kernel_size)
+                if kernel is None:
+                    kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (kernel_size, kernel_size))
+                    self._morph_kernels[kernel_size] = kernel
                 processed = cv2.morphologyEx(thresholded, cv2.MORPH_CLOSE, kernel)
-                processed = cv2.morphologyEx(processed, cv2.MORPH_OPEN, kernel)
+                # Opening in place on the fresh closing result
+                processed = cv2.morphologyEx(processed, cv2.MORPH_OPEN, kernel, dst=processed)
             else:
                 processed = thresholded
             
@@ -86,6 +106,13 @@ class PreprocessAdapter(PreprocessPort):
             self.logger.error(f"[Preprocess] Error preprocessing frame: {e}")
             return None
     
+    @staticmethod
+    def _scratch(buf: Optional[np.ndarray], shape: tuple) -> np.ndarray:
+        """Return buf if it is a uint8 array of shape, else a new one."""
+        if buf is None or buf.shape != shape:
+            return np.empty(shape, dtype=np.uint8)
+        return buf
+    
     def get_config(self) -> Dict[str, Any]:
         """Get preprocessing configuration."""
         return self.config.copy()
@@ -740,6 +740,10 @@ class WebServerAdapter:
             
             self.logger.info(f"Starting video stream for camera {camera_id}, stage={stage}")
             
+            # Raw-stage JPEGs are only encoded while someone is subscribed
+            subscribed_raw = stage == "raw"
+            if subscribed_raw:
+                manager.add_stream_subscriber()
             try:
                 frames_sent = 0
                 last_frame_data = None  # Track last frame to avoid sending duplicates
@@ -775,11 +779,8 @@ class WebServerAdapter:
                             self.logger.error(f"[Stream] Error sending frame for {camera_id}: {e}")
                             break
                     
-                    # Match the camera FPS for streaming rate
-                    metrics = manager.get_metrics()
-                    target_fps = metrics.get("settings", {}).get("fps", 30.0)
-                    frame_interval = 1.0 / target_fps if target_fps > 0 else 0.033
-                    await asyncio.sleep(frame_interval)
+                    # Match the camera FPS for streaming rate (interval cached on open/apply_settings)
+                    await asyncio.sleep(manager.stream_interval)
                     
             except WebSocketDisconnect:
                 self.logger.info(f"[Stream] WebSocket disconnected for camera {camera_id}")
@@ -789,6 +790,9 @@ class WebServerAdapter:
                     await websocket.close(code=1011, reason="Internal error")
                 except:
                     pass
+            finally:
+                if subscribed_raw:
+                    manager.remove_stream_subscriber()
 
         # Stage 7: WebSocket endpoint for StreamTap
         @self.app.websocket("/ws/vp/tap/{instance_id}/{tap_id}")
@@ -35,7 +35,11 @@ class AppOrchestrator:
         # Initialize camera service (needed for debug tree)
         self.camera_service = CameraService(
             self.logger,
-            self.camera_config_service
+            self.camera_config_service,
+            capture_core=self.config_service.get("capture_core"),
+            consumer_core=self.config_service.get("consumer_core"),
+            opencv_threads=self.config_service.get("opencv_threads"),
+            opencl_grayscale=bool(self.config_service.get("opencl_grayscale", False)),
         )
         
         # Initialize domain managers
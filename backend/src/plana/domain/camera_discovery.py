@@ -1,6 +1,6 @@
 """Camera discovery domain service."""
 
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from ..ports.camera_discovery_port import CameraDiscoveryPort
 from ..services.message_bus import MessageBus
 from ..services.logging_service import LoggingService
@@ -22,6 +22,8 @@ class CameraDiscovery:
         self.logger = logger
         self.camera_config_service = camera_config_service
         self._cameras: List[Dict[str, Any]] = []
+        # (camera list it was built from, ids, discovered names) for get_camera_columns()
+        self._columns: Optional[Tuple[List[Dict[str, Any]], Tuple[str, ...], Tuple[str, ...]]] = None
         self._update_cameras()
     
     def get_camera_list(self) -> List[Dict[str, Any]]:
@@ -37,6 +39,24 @@ class CameraDiscovery:
                 camera["config"] = self.camera_config_service.get_camera_config(camera["id"])
         return cameras
     
+    def get_camera_columns(self) -> Tuple[Tuple[str, ...], Tuple[str, ...]]:
+        """Parallel (ids, display names) for all cameras, custom names applied.
+        
+        Lighter than get_camera_list() for pollers that only need identity: no per-camera config
+        is loaded, and ids/discovered names are rebuilt only when the camera list changes.
+        """
+        cameras = self._cameras
+        columns = self._columns
+        if columns is None or columns[0] is not cameras:
+            ids = tuple(camera.get("id") or "" for camera in cameras)
+            names = tuple(camera.get("name") or camera_id for camera, camera_id in zip(cameras, ids))
+            columns = self._columns = (cameras, ids, names)
+        _, ids, names = columns
+        if self.camera_config_service:
+            get_name = self.camera_config_service.get_camera_name
+            names = tuple(get_name(camera_id) or name for camera_id, name in zip(ids, names))
+        return ids, names
+    
     def get_camera_details(self, camera_id: str) -> Optional[Dict[str, Any]]:
         """Get detailed information about a camera."""
         return self.discovery_port.get_camera_details(camera_id)
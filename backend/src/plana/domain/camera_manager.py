@@ -1,17 +1,51 @@
 """Camera manager for lifecycle and frame capture management."""
 
-import queue
 import threading
 import time
 import cv2
 import numpy as np
 from collections import deque
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 from ..ports.camera_port import CameraPort
 from ..ports.stream_encoder_port import StreamEncoderPort
 from ..services.logging_service import LoggingService
 from .vision_pipeline import VisionPipeline
 
+# Encoded stream frames kept per camera. Only the newest is served, so retaining more just
+# keeps extra JPEG payloads alive.
+_STREAM_QUEUE_MAXLEN = 2
+_DEFAULT_STREAM_INTERVAL = 0.033
+# Preallocated capture buffers cycled by the capture thread. A slot is rewritten after this many
+# newer frames from the same camera, which a slow consumer pass can outlast; frames kept past the
+# current camera's step must not alias a slot (see CameraService._consume_cameras).
+_RAW_RING_SIZE = 4
+# Hot-path OpenCV bindings resolved once at import (module globals instead of cv2 attribute lookups per frame)
+_cvt_color = cv2.cvtColor
+_COLOR_BGR2GRAY = cv2.COLOR_BGR2GRAY
+# BGR->GRAY on the OpenCL device (cv2.UMat) instead of the CPU; off unless enabled via enable_opencl_grayscale()
+_opencl_grayscale = False
+# Per-frame errors from one camera are logged at most once per interval
+_ERROR_LOG_INTERVAL_NS = 1_000_000_000
+
+
+def enable_opencl_grayscale() -> bool:
+    """Run BGR->GRAY through cv2.UMat when OpenCV has a usable OpenCL device. Returns True if enabled."""
+    global _opencl_grayscale
+    try:
+        if cv2.ocl.haveOpenCL():
+            cv2.ocl.setUseOpenCL(True)
+            _opencl_grayscale = cv2.ocl.useOpenCL()
+    except Exception:
+        _opencl_grayscale = False
+    return _opencl_grayscale
+
+
+def _bgr_to_gray(frame: np.ndarray, dst: Optional[np.ndarray] = None) -> np.ndarray:
+    """BGR->GRAY, offloaded to OpenCL when enabled (only the gray plane is read back)."""
+    if _opencl_grayscale:
+        return _cvt_color(cv2.UMat(frame), _COLOR_BGR2GRAY).get()
+    return _cvt_color(frame, _COLOR_BGR2GRAY, dst=dst)
+
 
 class CameraManager:
     """Manages camera lifecycle and frame capture."""
@@ -35,19 +69,37 @@ class CameraManager:
         self.height: int = 0
         self.fps: float = 0.0
         self.format: str = ''
-        
-        # Bounded frame queue for processed/JPEG frames (streaming UI)
-        self.frame_queue: deque = deque(maxlen=10)
-        self.frame_queue_lock = threading.Lock()
-        
-        # Per-camera queue of 1: latest raw frame only. Camera manager thread puts; camera source (pipeline) gets.
-        self.raw_frame_queue: queue.Queue = queue.Queue(maxsize=1)
+        # Open state tracked on open/close so hot loops don't cross into the adapter per frame
+        self._is_open = False
+        # Open /ws/stream raw-stage viewers; stream frames are only JPEG-encoded while this is > 0
+        self.stream_subscribers = 0
+        # Seconds between stream frames at the camera's actual FPS (updated on open/apply_settings)
+        self.stream_interval: float = _DEFAULT_STREAM_INTERVAL
+        # Stream preview downscale factor in (0, 1] (camera config "preview_scale"); pipelines get full frames
+        self.preview_scale: float = 1.0
+        self._preview_buf: Optional[np.ndarray] = None
+        # Reused BGR->GRAY output buffer (allocated on open, resized on resolution change)
+        self._gray_buf: Optional[np.ndarray] = None
+        
+        # Bounded frame queue for processed/JPEG frames (streaming UI). Single producer (the consumer
+        # pass) appends, readers take [-1]; deque append/clear/index are atomic under the GIL, so no lock.
+        self.frame_queue: deque = deque(maxlen=_STREAM_QUEUE_MAXLEN)
+        
+        # Per-camera slot of 1: latest raw frame only. Camera manager thread puts; camera source (pipeline) gets.
+        # Guarded by a condition so a blocking get_raw_frame() wakes as soon as a frame arrives.
+        self._raw_frame: Optional[np.ndarray] = None
+        self._raw_cv = threading.Condition()
+        # Capture ring (see next_capture_buffer): allocated on open, reallocated on resolution change
+        self._raw_ring: List[np.ndarray] = []
+        self._raw_ring_idx = 0
         
         # Metrics
         self.frames_captured = 0
         self.frames_dropped = 0
-        self.last_frame_time = 0.0
+        self.last_frame_time_ns = 0  # time.monotonic_ns() of the last frame; 0 = none yet
         self.metrics_lock = threading.Lock()
+        # monotonic_ns of the last logged per-frame error (see error_log_due)
+        self._last_error_log_ns = 0
         
         self.logger.info("[CameraManager] Initialized")
     
@@ -73,20 +125,17 @@ class CameraManager:
         self.height = height
         self.fps = fps
         self.format = format
+        self._is_open = True
+        self._sync_to_actual_settings()
         
         # Clear queues
-        with self.frame_queue_lock:
-            self.frame_queue.clear()
-        while True:
-            try:
-                self.raw_frame_queue.get_nowait()
-            except queue.Empty:
-                break
+        self.frame_queue.clear()
+        self._clear_raw_frame()
         # Reset metrics
         with self.metrics_lock:
             self.frames_captured = 0
             self.frames_dropped = 0
-            self.last_frame_time = 0.0
+            self.last_frame_time_ns = 0
         
         # Note: Capture is now handled by a single thread in CameraService
         # No need to start individual capture threads here
@@ -96,24 +145,93 @@ class CameraManager:
     
     def close(self) -> None:
         """Close camera."""
+        self._is_open = False
         # Close camera
         if self.camera_port.is_open():
             self.camera_port.close()
         
         # Clear queues
-        with self.frame_queue_lock:
-            self.frame_queue.clear()
-        while True:
-            try:
-                self.raw_frame_queue.get_nowait()
-            except queue.Empty:
-                break
+        self.frame_queue.clear()
+        self._clear_raw_frame()
         self.device_path = None
+        self._gray_buf = None
+        self._preview_buf = None
+        self._raw_ring = []
         self.logger.info("[CameraManager] Camera closed")
     
     def is_open(self) -> bool:
         """Check if camera is open."""
-        return self.camera_port.is_open()
+        return self._is_open
+    
+    def mark_disconnected(self) -> None:
+        """Mark camera closed after the device stopped delivering frames (e.g. unplugged)."""
+        if self._is_open:
+            self._is_open = False
+            self.logger.warning(f"[CameraManager] Camera disconnected: {self.device_path}")
+    
+    def add_stream_subscriber(self) -> None:
+        """Register a raw-stage stream viewer (enables JPEG encoding of stream frames)."""
+        with self.metrics_lock:
+            self.stream_subscribers += 1
+    
+    def remove_stream_subscriber(self) -> None:
+        """Unregister a raw-stage stream viewer; drops queued JPEGs when the last one leaves."""
+        with self.metrics_lock:
+            self.stream_subscribers = max(0, self.stream_subscribers - 1)
+            last_viewer_left = self.stream_subscribers == 0
+        if last_viewer_left:
+            # A later viewer must not be served a stale frame from before encoding stopped
+            self.frame_queue.clear()
+    
+    def _push_stream_frame(self, frame_data: bytes) -> None:
+        """Append a JPEG to the stream queue; a full queue evicts the oldest, counted as a drop."""
+        was_full = len(self.frame_queue) >= _STREAM_QUEUE_MAXLEN
+        self.frame_queue.append(frame_data)
+        if was_full:
+            with self.metrics_lock:
+                self.frames_dropped += 1
+    
+    def error_log_due(self) -> bool:
+        """Rate limit for hot-path error logs: True at most once per second for this camera."""
+        now = time.monotonic_ns()
+        if now - self._last_error_log_ns < _ERROR_LOG_INTERVAL_NS:
+            return False
+        self._last_error_log_ns = now
+        return True
+    
+    def _sync_to_actual_settings(self) -> None:
+        """Recompute the stream interval and size the frame buffers from what the driver negotiated.
+        
+        Drivers may round or substitute the requested resolution, and a mismatched capture buffer
+        would be ignored by read(). Raw-GREY frames are already single-channel and never decode
+        into the ring, so neither buffer is kept for them.
+        """
+        actual = self.camera_port.get_actual_settings()
+        actual_fps = actual.get("fps") or 0.0
+        self.stream_interval = 1.0 / actual_fps if actual_fps > 0 else _DEFAULT_STREAM_INTERVAL
+        if self.camera_port.is_raw_grey():
+            self._gray_buf = None
+            self._raw_ring = []
+            return
+        width = actual.get("width") or self.width
+        height = actual.get("height") or self.height
+        if self._gray_buf is None or self._gray_buf.shape != (height, width):
+            self._gray_buf = np.empty((height, width), dtype=np.uint8)
+        if not self._raw_ring or self._raw_ring[0].shape != (height, width, 3):
+            self._alloc_raw_ring(width, height)
+    
+    def to_grayscale(self, frame: np.ndarray) -> np.ndarray:
+        """Convert a BGR frame to grayscale into this camera's reused buffer.
+        
+        The result is overwritten by the next call; copy it if it must outlive the current frame.
+        Single-channel frames are returned unchanged.
+        """
+        if frame.ndim != 3:
+            return frame
+        gray_buf = self._gray_buf
+        if gray_buf is None or gray_buf.shape != frame.shape[:2]:
+            gray_buf = self._gray_buf = np.empty(frame.shape[:2], dtype=np.uint8)
+        return _bgr_to_gray(frame, gray_buf)
     
     def get_latest_frame(self, stage: str = "raw") -> Optional[bytes]:
         """Get latest frame from queue for a specific stage.
@@ -131,11 +249,12 @@ class CameraManager:
                 return stage_frame.get_jpeg_bytes()
             return None
         
-        # For raw stage, get from frame queue
+        # For raw stage, get from frame queue (single appender; deque ops are atomic, no lock needed)
         if stage == "raw":
-            with self.frame_queue_lock:
-                if self.frame_queue:
-                    return self.frame_queue[-1]
+            try:
+                return self.frame_queue[-1]
+            except IndexError:
+                return None
         return None
     
     def get_latest_detections(self) -> list:
@@ -145,14 +264,18 @@ class CameraManager:
         return []
     
     def get_metrics(self) -> Dict[str, Any]:
-        """Get capture metrics."""
+        """Get capture metrics.
+        
+        Always returns the same keys (frames_captured, frames_drops, frames_dropped, fps, drops,
+        last_frame_age, device_path, settings); callers may index them directly.
+        """
         with self.metrics_lock:
-            current_time = time.time()
-            age_ms = (current_time - self.last_frame_time) * 1000 if self.last_frame_time > 0 else 0.0
+            last_frame_time_ns = self.last_frame_time_ns
+            age_ms = (time.monotonic_ns() - last_frame_time_ns) / 1e6 if last_frame_time_ns > 0 else 0.0
             
             # Calculate FPS more accurately using frame age
             fps = 0.0
-            if self.last_frame_time > 0 and age_ms < 2000:  # If frame is less than 2 seconds old
+            if last_frame_time_ns > 0 and age_ms < 2000:  # If frame is less than 2 seconds old
                 # Calculate FPS from frame age (inverse of frame interval)
                 if age_ms > 0:
                     calculated_fps = 1000.0 / age_ms
@@ -191,9 +314,7 @@ class CameraManager:
             self.height = height
             self.fps = fps
             self.format = format
-            
-            # Update FPS interval for capture loop
-            # The loop will pick up the new fps value on next iteration
+            self._sync_to_actual_settings()
         
         return success
     
@@ -252,39 +373,68 @@ class CameraManager:
         return self.camera_port.apply_control_settings(exposure, gain, saturation)
     
     def enqueue_raw_frame(self, raw_frame: np.ndarray) -> bool:
-        """Put latest raw frame into queue of 1. Called by camera manager (capture) thread.
-        If queue full, replace with new frame so camera source always gets latest.
+        """Put latest raw frame into the slot of 1. Called by camera manager (capture) thread.
+        An unconsumed frame is replaced so camera source always gets latest; waiters are notified.
         """
-        try:
-            try:
-                self.raw_frame_queue.put_nowait(raw_frame)
-            except queue.Full:
-                try:
-                    self.raw_frame_queue.get_nowait()
-                except queue.Empty:
-                    pass
-                try:
-                    self.raw_frame_queue.put_nowait(raw_frame)
-                except queue.Full:
-                    with self.metrics_lock:
-                        self.frames_dropped += 1
-                    return False
-            with self.metrics_lock:
-                self.frames_captured += 1
-                self.last_frame_time = time.time()
-            return True
-        except Exception as e:
-            self.logger.error(f"[CameraManager] Error enqueueing raw frame: {e}")
-            with self.metrics_lock:
-                self.frames_dropped += 1
-            return False
+        with self._raw_cv:
+            self._raw_frame = raw_frame
+            self._raw_cv.notify()
+        with self.metrics_lock:
+            self.frames_captured += 1
+            self.last_frame_time_ns = time.monotonic_ns()
+        return True
 
     def get_raw_frame(self, timeout: Optional[float] = None) -> Optional[np.ndarray]:
-        """Get next raw frame from queue. Called by camera source (pipeline); blocks until frame or timeout."""
+        """Take the latest raw frame. Called by camera source (pipeline); blocks until frame or timeout
+        (timeout=0.0 never blocks, None waits indefinitely)."""
+        with self._raw_cv:
+            if self._raw_frame is None and timeout != 0.0:
+                self._raw_cv.wait_for(lambda: self._raw_frame is not None, timeout=timeout)
+            raw_frame, self._raw_frame = self._raw_frame, None
+        return raw_frame
+    
+    def set_preview_scale(self, scale: Any) -> None:
+        """Set the stream preview downscale factor; values outside (0, 1] mean full size."""
         try:
-            return self.raw_frame_queue.get(timeout=timeout)
-        except queue.Empty:
+            scale = float(scale)
+        except (TypeError, ValueError):
+            scale = 1.0
+        self.preview_scale = scale if 0.0 < scale < 1.0 else 1.0
+    
+    def scale_preview(self, frame: np.ndarray) -> np.ndarray:
+        """Downscale a stream frame by preview_scale into a reused buffer (overwritten by the next call).
+        
+        Area averaging for color streams; nearest for gray/apriltag debug views.
+        """
+        scale = self.preview_scale
+        if scale == 1.0:
+            return frame
+        height, width = frame.shape[:2]
+        size = (max(1, int(width * scale)), max(1, int(height * scale)))
+        shape = (size[1], size[0]) + frame.shape[2:]
+        preview_buf = self._preview_buf
+        if preview_buf is None or preview_buf.shape != shape:
+            preview_buf = self._preview_buf = np.empty(shape, dtype=np.uint8)
+        interpolation = cv2.INTER_NEAREST if frame.ndim == 2 or self.use_case == "apriltag" else cv2.INTER_AREA
+        return cv2.resize(frame, size, dst=preview_buf, interpolation=interpolation)
+    
+    def _alloc_raw_ring(self, width: int, height: int) -> None:
+        """Preallocate the BGR capture buffers for the given resolution."""
+        self._raw_ring = [np.empty((height, width, 3), dtype=np.uint8) for _ in range(_RAW_RING_SIZE)]
+        self._raw_ring_idx = 0
+    
+    def next_capture_buffer(self) -> Optional[np.ndarray]:
+        """Next preallocated buffer for capture_frame_raw(out=...). Capture thread only."""
+        ring = self._raw_ring
+        if not ring:
             return None
+        self._raw_ring_idx = (self._raw_ring_idx + 1) % len(ring)
+        return ring[self._raw_ring_idx]
+    
+    def _clear_raw_frame(self) -> None:
+        """Drop any unconsumed raw frame."""
+        with self._raw_cv:
+            self._raw_frame = None
     
     def process_vision_pipeline(self) -> bool:
         """Process one frame from camera queue through vision pipeline.
@@ -298,33 +448,25 @@ class CameraManager:
             return False
         
         try:
-            # Convert raw frame to grayscale for AprilTag cameras
-            if len(raw_frame.shape) == 3:
-                raw_frame_gray = cv2.cvtColor(raw_frame, cv2.COLOR_BGR2GRAY)
-                # Convert to 3-channel for consistency (BGR format but grayscale)
-                raw_frame_gray_bgr = cv2.cvtColor(raw_frame_gray, cv2.COLOR_GRAY2BGR)
-            else:
-                raw_frame_gray_bgr = raw_frame
+            # Pipeline runs on grayscale; pass the single-channel frame itself (stages and overlays
+            # accept 2D frames). Not the reused gray buffer: the pipeline keeps raw frames.
+            if raw_frame.ndim == 3:
+                raw_frame = _bgr_to_gray(raw_frame)
             
             # Process frame through vision pipeline (pass grayscale version)
-            pipeline_result = self.vision_pipeline.process_frame(raw_frame_gray_bgr)
+            pipeline_result = self.vision_pipeline.process_frame(raw_frame)
             
-            # Store raw frame JPEG in processed frame queue
-            if pipeline_result.get("raw"):
+            # Store raw frame JPEG in processed frame queue (encoded only while a raw-stage viewer is subscribed;
+            # the pipeline itself still runs for every frame)
+            if self.stream_subscribers and pipeline_result.get("raw"):
                 raw_jpeg = pipeline_result["raw"].get_jpeg_bytes()
-                with self.frame_queue_lock:
-                    was_full = len(self.frame_queue) >= self.frame_queue.maxlen
-                    old_frame_count = len(self.frame_queue)
-                    self.frame_queue.append(raw_jpeg)
-                    
-                    if was_full and len(self.frame_queue) == old_frame_count:
-                        with self.metrics_lock:
-                            self.frames_dropped += 1
+                self._push_stream_frame(raw_jpeg)
             
             return True
         
         except Exception as e:
-            self.logger.error(f"[CameraManager] Error processing vision pipeline: {e}")
+            if self.error_log_due():
+                self.logger.error(f"[CameraManager] Error processing vision pipeline: {e}")
             with self.metrics_lock:
                 self.frames_dropped += 1
             return False
@@ -342,18 +484,11 @@ class CameraManager:
                 # Store raw frame JPEG (color)
                 if pipeline_result.get("raw"):
                     raw_jpeg = pipeline_result["raw"].get_jpeg_bytes()
-                    with self.frame_queue_lock:
-                        was_full = len(self.frame_queue) >= self.frame_queue.maxlen
-                        old_frame_count = len(self.frame_queue)
-                        self.frame_queue.append(raw_jpeg)
-                        
-                        if was_full and len(self.frame_queue) == old_frame_count:
-                            with self.metrics_lock:
-                                self.frames_dropped += 1
+                    self._push_stream_frame(raw_jpeg)
                 
                 with self.metrics_lock:
                     self.frames_captured += 1
-                    self.last_frame_time = time.time()
+                    self.last_frame_time_ns = time.monotonic_ns()
                 
                 return True
             else:
@@ -361,18 +496,11 @@ class CameraManager:
                 frame_data = self.camera_port.capture_frame(grayscale=False)
                 
                 if frame_data:
-                    with self.frame_queue_lock:
-                        was_full = len(self.frame_queue) >= self.frame_queue.maxlen
-                        old_frame_count = len(self.frame_queue)
-                        self.frame_queue.append(frame_data)
-                        
-                        if was_full and len(self.frame_queue) == old_frame_count:
-                            with self.metrics_lock:
-                                self.frames_dropped += 1
+                    self._push_stream_frame(frame_data)
                     
                     with self.metrics_lock:
                         self.frames_captured += 1
-                        self.last_frame_time = time.time()
+                        self.last_frame_time_ns = time.monotonic_ns()
                     
                     return True
                 else:
@@ -418,18 +546,11 @@ class CameraManager:
                 # Store raw frame JPEG (color)
                 if pipeline_result.get("raw"):
                     raw_jpeg = pipeline_result["raw"].get_jpeg_bytes()
-                    with self.frame_queue_lock:
-                        was_full = len(self.frame_queue) >= self.frame_queue.maxlen
-                        old_frame_count = len(self.frame_queue)
-                        self.frame_queue.append(raw_jpeg)
-                        
-                        if was_full and len(self.frame_queue) == old_frame_count:
-                            with self.metrics_lock:
-                                self.frames_dropped += 1
+                    self._push_stream_frame(raw_jpeg)
                 
                 with self.metrics_lock:
                     self.frames_captured += 1
-                    self.last_frame_time = time.time()
+                    self.last_frame_time_ns = time.monotonic_ns()
                 
                 return True
             else:
@@ -437,18 +558,11 @@ class CameraManager:
                 frame_data = self.camera_port.capture_frame(grayscale=False)
                 
                 if frame_data:
-                    with self.frame_queue_lock:
-                        was_full = len(self.frame_queue) >= self.frame_queue.maxlen
-                        old_frame_count = len(self.frame_queue)
-                        self.frame_queue.append(frame_data)
-                        
-                        if was_full and len(self.frame_queue) == old_frame_count:
-                            with self.metrics_lock:
-                                self.frames_dropped += 1
+                    self._push_stream_frame(frame_data)
                     
                     with self.metrics_lock:
                         self.frames_captured += 1
-                        self.last_frame_time = time.time()
+                        self.last_frame_time_ns = time.monotonic_ns()
                     
                     return True
                 else:
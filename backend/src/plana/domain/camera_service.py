@@ -1,17 +1,29 @@
 """Camera service for managing multiple cameras."""
 
+import os
 import threading
 import time
-from typing import Dict, Optional, Any
-from .camera_manager import CameraManager
+from concurrent.futures import ThreadPoolExecutor
+from types import MappingProxyType
+from typing import Callable, Dict, List, Mapping, Optional, Any, Tuple
+import cv2
+from .camera_manager import CameraManager, enable_opencl_grayscale
 from ..adapters.opencv_camera import OpenCVCameraAdapter
 from ..adapters.mjpeg_encoder import MJPEGEncoderAdapter
 from ..adapters.preprocess_adapter import PreprocessAdapter
 from ..adapters.apriltag_detector_adapter import AprilTagDetectorAdapter
+from ..adapters.gpu_frame_encoder import encode_frames_to_jpeg, is_fused_gray_encoding_available
 from ..domain.vision_pipeline import VisionPipeline
 from ..services.logging_service import LoggingService
 from ..services.camera_config_service import CameraConfigService
 
+# Idle waits for the capture/consumer loops; waiting on the stop event keeps shutdown prompt.
+_NO_CAMERAS_WAIT_S = 0.1
+# Upper bound on the consumer's blocking wait for a frame (it is woken as soon as one is enqueued)
+_FRAME_WAIT_TIMEOUT_S = 0.5
+# Consecutive inline passes longer than a frame period before a single camera is handed to the consumer thread
+_INLINE_SLOW_PASS_LIMIT = 3
+
 
 class CameraService:
     """Service for managing multiple camera instances."""
@@ -19,23 +31,64 @@ class CameraService:
     def __init__(
         self,
         logger: LoggingService,
-        camera_config_service: CameraConfigService
+        camera_config_service: CameraConfigService,
+        capture_core: Optional[int] = None,
+        consumer_core: Optional[int] = None,
+        opencv_threads: Optional[int] = None,
+        opencl_grayscale: bool = False,
     ):
         self.logger = logger
         self.camera_config_service = camera_config_service
+        # Optional CPU pinning for the capture and consumer threads (None = let the scheduler decide)
+        self.capture_core = capture_core
+        self.consumer_core = consumer_core
         self.camera_managers: Dict[str, CameraManager] = {}
+        # Per-camera capture bodies built on open (see _make_capture_step), guarded by _capture_lock.
+        # The capture loop iterates an immutable tuple of them, replaced whenever the dict changes.
+        self._capture_steps: Dict[str, Callable[[], None]] = {}
+        self._capture_step_snapshot: Tuple[Callable[[], None], ...] = ()
+        # Immutable (camera_id, manager) snapshot for the consumer loop; rebuilt on open/close only
+        self._camera_snapshot: Tuple[Tuple[str, CameraManager], ...] = ()
+        # Read-only view handed to get_all_camera_managers() callers; replaced with the snapshot
+        self._managers_view: Mapping[str, CameraManager] = MappingProxyType({})
+        # Consumer error log prefixes per camera, formatted with the snapshot rather than per error
+        self._consumer_error_prefixes: Dict[str, str] = {}
         
-        # Single capture-only thread: only capture_frame_raw() and enqueue_raw_frame() for all cameras.
+        # Single capture thread: capture_frame_raw() and enqueue_raw_frame() for all cameras
+        # (also consumes inline while only one camera is open).
         self._capture_thread: Optional[threading.Thread] = None
         self._capture_running = False
         self._capture_lock = threading.Lock()
+        self._capture_stop = threading.Event()
         
-        # Consumer thread: pulls raw from queues, runs pipeline or encodes to JPEG for stream.
+        # Consumer thread (2+ cameras): pulls raw from queues, runs pipeline or encodes to JPEG for stream.
         self.vision_pipeline_thread: Optional[threading.Thread] = None
         self.vision_pipeline_running = False
         self.vision_pipeline_thread_lock = threading.Lock()
+        self._consumer_stop = threading.Event()
+        # Set by the capture thread after enqueueing a raw frame; the consumer blocks on it when idle
+        self._frames_ready = threading.Event()
+        # With a single camera open the capture thread consumes inline and no consumer thread runs.
+        # That saves a thread hop per frame, but nothing is read from the device while the pass runs:
+        # once passes outlast the frame period the driver's queued (stale) frames would feed the
+        # pipeline and latency would grow, so the capture step then hands off to the consumer thread,
+        # which always takes the latest frame. Reset when the camera set changes.
+        # The lock keeps one consumer per pass while switching between the two modes.
+        self._inline_consume = True
+        self._consume_lock = threading.Lock()
+        # Parallel JPEG encode when several cameras stream at once; created on demand, guarded by _consume_lock
+        self._encode_pool: Optional[ThreadPoolExecutor] = None
+        self._encode_pool_size = 0
+        
+        if opencv_threads is not None:
+            self._configure_opencv_threads(opencv_threads)
+        if opencl_grayscale:
+            if enable_opencl_grayscale():
+                self.logger.info("[CameraService] Grayscale conversion offloaded to OpenCL")
+            else:
+                self.logger.warning("[CameraService] opencl_grayscale requested but no usable OpenCL device; using CPU")
         
-        self.logger.info("[CameraService] Initialized: single capture-only thread, consumer thread (pipeline/encode)")
+        self.logger.info("[CameraService] Initialized: single capture thread, consumer thread for 2+ cameras (pipeline/encode)")
     
     def open_camera(
         self,
@@ -54,22 +107,28 @@ class CameraService:
         If stream_only is True, opens without vision pipeline (stream only).
         If camera is already open but config use_case changed (e.g. to apriltag), close and reopen so Y-plane/grayscale applies.
         """
-        camera_config = self.camera_config_service.get_camera_config(camera_id) or {}
-        if camera_id in self.camera_managers and self.camera_managers[camera_id].is_open():
-            manager = self.camera_managers[camera_id]
+        existing = self.camera_managers.get(camera_id)
+        if existing is not None and existing.is_open():
+            if stream_only or vision_pipeline is not None:
+                # Explicit use_case: no config needed to decide (client reconnecting to a running camera)
+                self.logger.warning(f"[CameraService] Camera {camera_id} already open")
+                return True
+            manager = existing
+            camera_config = self.camera_config_service.get_camera_config(camera_id) or {}
             config_use_case = camera_config.get('use_case', 'stream_only')
-            if not stream_only and vision_pipeline is None and getattr(manager, 'use_case', None) != config_use_case:
+            if getattr(manager, 'use_case', None) != config_use_case:
                 self.logger.info(f"[CameraService] Camera {camera_id} use_case changed to {config_use_case}, reopening for Y-plane/grayscale")
                 self.close_camera(camera_id)
             else:
                 self.logger.warning(f"[CameraService] Camera {camera_id} already open")
                 return True
+        else:
+            camera_config = self.camera_config_service.get_camera_config(camera_id) or {}
 
-        # Get settings from config if not provided
+        # Get settings from config if not provided (config loaded once above)
         if width is None or height is None or fps is None or format is None:
-            config = self.camera_config_service.get_camera_config(camera_id)
-            if config and "resolution" in config:
-                res = config["resolution"]
+            if "resolution" in camera_config:
+                res = camera_config["resolution"]
                 width = width or res.get("width", 640)
                 height = height or res.get("height", 480)
                 fps = fps or res.get("fps", 30.0)
@@ -103,6 +162,7 @@ class CameraService:
             use_case=use_case,
             vision_pipeline=vision_pipeline
         )
+        manager.set_preview_scale(camera_config.get("preview_scale", 1.0))
         
         # Open camera. Phase 1: apriltag = try GREY (Y-only) first; fallback to config format.
         try:
@@ -135,6 +195,10 @@ class CameraService:
         
         # Store manager
         self.camera_managers[camera_id] = manager
+        self._refresh_camera_snapshot()
+        with self._capture_lock:
+            self._capture_steps[camera_id] = self._make_capture_step(camera_id, manager)
+            self._capture_step_snapshot = tuple(self._capture_steps.values())
         self.logger.info(
             f"[CameraService] open_camera: stored manager for {camera_id} camera_managers keys={list(self.camera_managers.keys())} "
             f"use_case={getattr(manager, 'use_case', '?')} vision_pipeline={manager.vision_pipeline is not None}"
@@ -148,10 +212,11 @@ class CameraService:
                 f"expected {width}x{height}@{fps}fps, got {verification.get('actual', {})}"
             )
         
-        # Start single capture-only thread if not already running
+        # Start single capture thread if not already running
         self._ensure_capture_thread_running()
-        # Start consumer thread (pipeline + encode for stream_only)
-        self._ensure_vision_pipeline_thread_running()
+        # Start consumer thread (pipeline + encode) once more than one camera is open
+        if not self._inline_consume:
+            self._ensure_vision_pipeline_thread_running()
         
         self.logger.info(f"[CameraService] Camera {camera_id} opened successfully")
         return True
@@ -165,18 +230,32 @@ class CameraService:
         manager = self.camera_managers[camera_id]
         manager.close()
         del self.camera_managers[camera_id]
+        self._refresh_camera_snapshot()
         
-        # Stop capture thread if no cameras remain
+        # Stop capture and consumer threads if no cameras remain (checked once)
         with self._capture_lock:
-            if len(self.camera_managers) == 0:
+            self._capture_steps.pop(camera_id, None)
+            self._capture_step_snapshot = tuple(self._capture_steps.values())
+            no_cameras_left = not self.camera_managers
+            if no_cameras_left:
                 self._stop_capture_thread()
-        # Stop consumer thread if no cameras remain
-        if len(self.camera_managers) == 0:
+        if no_cameras_left or self._inline_consume:
             self._stop_vision_pipeline_thread()
+        if no_cameras_left:
+            self._shutdown_encode_pool()
         
         self.logger.info(f"[CameraService] Camera {camera_id} closed")
         return True
     
+    def _refresh_camera_snapshot(self) -> None:
+        """Rebuild the consumer loop's camera snapshot after the camera set changed."""
+        self._camera_snapshot = tuple(self.camera_managers.items())
+        self._managers_view = MappingProxyType(dict(self._camera_snapshot))
+        self._inline_consume = len(self._camera_snapshot) <= 1
+        self._consumer_error_prefixes = {
+            camera_id: f"[CameraService] Consumer error for {camera_id}: " for camera_id in self.camera_managers
+        }
+    
     def is_camera_open(self, camera_id: str) -> bool:
         """Check if camera is open."""
         if camera_id not in self.camera_managers:
@@ -187,9 +266,24 @@ class CameraService:
         """Get camera manager for a camera."""
         return self.camera_managers.get(camera_id)
     
-    def get_all_camera_managers(self) -> Dict[str, CameraManager]:
-        """Get all camera managers."""
-        return self.camera_managers.copy()
+    def get_all_camera_managers(self) -> Mapping[str, CameraManager]:
+        """Get all camera managers as a read-only mapping.
+        
+        The mapping is rebuilt (not mutated) on open/close, so it is safe to iterate while
+        cameras open or close; it does not reflect changes made after the call.
+        """
+        return self._managers_view
+    
+    def get_all_camera_snapshots(self) -> List[Tuple[str, bool, Optional[Dict[str, Any]]]]:
+        """Get (camera_id, is_open, metrics) for every camera in one pass; metrics is None when closed.
+        
+        Reads the same immutable snapshot as get_all_camera_managers(), so no service lock is taken.
+        """
+        snapshots = []
+        for camera_id, manager in self._camera_snapshot:
+            is_open = manager.is_open()
+            snapshots.append((camera_id, is_open, manager.get_metrics() if is_open else None))
+        return snapshots
     
     def apply_camera_settings(
         self,
@@ -238,66 +332,155 @@ class CameraService:
         manager = self.camera_managers[camera_id]
         return manager.apply_control_settings(exposure, gain, saturation)
     
+    def _configure_opencv_threads(self, opencv_threads: int) -> None:
+        """Set OpenCV's worker thread count (process-wide, so it applies to every pipeline stage).
+        
+        Only called when opencv_threads is configured; OpenMP settings come from the environment
+        (see main.py), since omp_set_* calls would only affect the calling thread.
+        """
+        try:
+            cv2.setNumThreads(opencv_threads)
+            self.logger.info(f"[CameraService] OpenCV threads set to {opencv_threads}")
+        except Exception as e:
+            self.logger.warning(f"[CameraService] Could not set OpenCV thread count: {e}")
+    
+    def _pin_current_thread(self, core: Optional[int], name: str) -> None:
+        """Pin the calling thread to one CPU core (Linux only); no-op when core is None."""
+        if core is None:
+            return
+        if not hasattr(os, "sched_setaffinity"):
+            self.logger.warning(f"[CameraService] CPU pinning not supported on this platform ({name} thread)")
+            return
+        try:
+            os.sched_setaffinity(0, {core})
+            self.logger.info(f"[CameraService] Pinned {name} thread to CPU {core}")
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"[CameraService] Could not pin {name} thread to CPU {core}: {e}")
+    
     def _ensure_capture_thread_running(self) -> None:
-        """Start the single capture-only thread (only capture + enqueue raw; no conversion, no encode)."""
+        """Start the single capture thread (capture + enqueue raw; inline consume for a single camera)."""
         with self._capture_lock:
             if not self._capture_running and len(self.camera_managers) > 0:
                 self._capture_running = True
+                self._capture_stop.clear()
                 self._capture_thread = threading.Thread(target=self._capture_loop, daemon=True)
                 self._capture_thread.start()
-                self.logger.info("[CameraService] Single capture-only thread started (all cameras)")
+                self.logger.info("[CameraService] Single capture thread started (all cameras)")
     
     def _stop_capture_thread(self) -> None:
-        """Stop the single capture-only thread."""
+        """Stop the single capture thread."""
         if self._capture_running:
             self._capture_running = False
+            self._capture_stop.set()
             if self._capture_thread:
                 self._capture_thread.join(timeout=2.0)
                 self._capture_thread = None
-            self.logger.info("[CameraService] Capture-only thread stopped")
+            self.logger.info("[CameraService] Capture thread stopped")
     
     def _capture_loop(self) -> None:
-        """Single thread: only capture and enqueue raw for all cameras. No conversion, no encode."""
-        self.logger.info("[CameraService] Capture loop started - capture only, no processing")
+        """Single thread: capture and enqueue raw for all cameras; consumes inline when only one camera is open."""
+        self.logger.info("[CameraService] Capture loop started")
+        self._pin_current_thread(self.capture_core, "capture")
         while self._capture_running:
-            with self._capture_lock:
-                cameras = list(self.camera_managers.items())
-            if not cameras:
-                time.sleep(0.1)
+            steps = self._capture_step_snapshot
+            if not steps:
+                self._capture_stop.wait(_NO_CAMERAS_WAIT_S)
                 continue
-            for camera_id, manager in cameras:
+            for capture_step in steps:
                 if not self._capture_running:
                     break
-                if not manager.camera_port.is_open():
-                    continue
-                try:
-                    raw_frame = manager.camera_port.capture_frame_raw()
-                    if raw_frame is not None:
-                        manager.enqueue_raw_frame(raw_frame)
+                capture_step()
+        self.logger.info("[CameraService] Capture loop stopped")
+    
+    def _make_capture_step(self, camera_id: str, manager: CameraManager) -> Callable[[], None]:
+        """Build one camera's per-frame capture body with its collaborators bound once at open time."""
+        is_open = manager.is_open
+        capture_frame_raw = manager.camera_port.capture_frame_raw
+        enqueue_raw_frame = manager.enqueue_raw_frame
+        next_capture_buffer = manager.next_capture_buffer
+        single_camera = ((camera_id, manager),)
+        error_prefix = f"[CameraService] Capture error for {camera_id}: "
+        slow_passes = 0
+        
+        def capture_step() -> None:
+            nonlocal slow_passes
+            if not is_open():
+                return
+            try:
+                raw_frame = capture_frame_raw(next_capture_buffer())
+                if raw_frame is not None:
+                    enqueue_raw_frame(raw_frame)
+                    if self._inline_consume:
+                        started = time.perf_counter()
+                        self._consume_cameras(single_camera)
+                        if time.perf_counter() - started <= manager.stream_interval:
+                            slow_passes = 0
+                        else:
+                            slow_passes += 1
+                            if slow_passes >= _INLINE_SLOW_PASS_LIMIT:
+                                slow_passes = 0
+                                self._stop_inline_consume(camera_id)
                     else:
-                        with manager.metrics_lock:
-                            manager.frames_dropped += 1
-                except Exception as e:
-                    self.logger.error(f"[CameraService] Capture error for {camera_id}: {e}")
+                        self._frames_ready.set()
+                else:
                     with manager.metrics_lock:
                         manager.frames_dropped += 1
-        self.logger.info("[CameraService] Capture loop stopped")
+                    # Only check the device on failure; open/close keep the flag current otherwise
+                    if not manager.camera_port.is_open():
+                        manager.mark_disconnected()
+            except Exception as e:
+                if manager.error_log_due():
+                    self.logger.error(error_prefix + str(e))
+                with manager.metrics_lock:
+                    manager.frames_dropped += 1
+        
+        return capture_step
+    
+    def _stop_inline_consume(self, camera_id: str) -> None:
+        """Move a single camera's pipeline/encode off the capture thread once passes outlast its frame period."""
+        self._inline_consume = False
+        self._ensure_vision_pipeline_thread_running()
+        self.logger.info(
+            f"[CameraService] Processing for {camera_id} is slower than its frame rate; "
+            "moved to the consumer thread so the pipeline keeps getting the latest frame"
+        )
     
     def _ensure_vision_pipeline_thread_running(self) -> None:
         """Ensure the consumer thread is running (pipeline + encode for stream_only)."""
         with self.vision_pipeline_thread_lock:
             if not self.vision_pipeline_running and len(self.camera_managers) > 0:
                 self.vision_pipeline_running = True
+                self._consumer_stop.clear()
                 self.vision_pipeline_thread = threading.Thread(
                     target=self._vision_pipeline_loop, daemon=True
                 )
                 self.vision_pipeline_thread.start()
                 self.logger.info("[CameraService] Consumer thread started (pipeline + encode)")
     
+    def _get_encode_pool(self, batch_size: int) -> ThreadPoolExecutor:
+        """Return the encode pool, sized min(cores, batch); grown when more cameras stream. Call under _consume_lock."""
+        size = max(1, min(os.cpu_count() or 1, batch_size))
+        if self._encode_pool is None or self._encode_pool_size < size:
+            if self._encode_pool is not None:
+                self._encode_pool.shutdown(wait=False)
+            self._encode_pool = ThreadPoolExecutor(max_workers=size, thread_name_prefix="jpeg-encode")
+            self._encode_pool_size = size
+        return self._encode_pool
+    
+    def _shutdown_encode_pool(self) -> None:
+        """Release the encode pool's worker threads (no cameras left)."""
+        with self._consume_lock:
+            if self._encode_pool is not None:
+                self._encode_pool.shutdown(wait=True)
+                self._encode_pool = None
+                self._encode_pool_size = 0
+    
     def _stop_vision_pipeline_thread(self) -> None:
         """Stop the vision pipeline processing thread."""
         if self.vision_pipeline_running:
             self.vision_pipeline_running = False
+            self._consumer_stop.set()
+            self._frames_ready.set()
             if self.vision_pipeline_thread:
                 self.vision_pipeline_thread.join(timeout=2.0)
                 self.vision_pipeline_thread = None
@@ -305,48 +488,76 @@ class CameraService:
     
     def _vision_pipeline_loop(self) -> None:
         """Consumer thread: pull raw from each camera's queue; run pipeline or encode to JPEG for stream."""
-        import cv2
-        from ..adapters.gpu_frame_encoder import encode_frame_to_jpeg
         self.logger.info("[CameraService] Consumer loop started (pipeline + encode for all cameras)")
+        self._pin_current_thread(self.consumer_core, "consumer")
         while self.vision_pipeline_running:
-            processed_any = False
-            with self.vision_pipeline_thread_lock:
-                if not self.vision_pipeline_running:
-                    break
-                cameras = [
-                    (camera_id, manager)
-                    for camera_id, manager in self.camera_managers.items()
-                    if manager.is_open()
-                ]
+            cameras = self._camera_snapshot
             if not cameras:
-                time.sleep(0.1)
+                self._consumer_stop.wait(_NO_CAMERAS_WAIT_S)
                 continue
+            # Clear before draining: a frame enqueued during this pass leaves it set for the next wait
+            self._frames_ready.clear()
+            if not self._consume_cameras(cameras):
+                self._frames_ready.wait(_FRAME_WAIT_TIMEOUT_S)
+        self.logger.info("[CameraService] Consumer loop stopped")
+    
+    def _consume_cameras(self, cameras: Tuple[Tuple[str, CameraManager], ...]) -> bool:
+        """One consumer pass over cameras: run pipelines, encode stream frames to JPEG.
+        
+        Runs on the consumer thread, or inline on the capture thread when a single camera is open.
+        Returns True if any camera had a frame to process.
+        """
+        with self._consume_lock:
+            processed_any = False
+            # Stream frames gathered this pass and encoded together (encoder resolved once)
+            to_encode = []
+            # libjpeg-turbo can write a gray JPEG straight from BGR; otherwise convert first
+            fused_gray = is_fused_gray_encoding_available()
+            # Inline passes run on the capture thread itself, so no ring slot is rewritten before encode
+            inline = threading.current_thread() is self._capture_thread
             for camera_id, manager in cameras:
-                if not self.vision_pipeline_running:
-                    break
+                if not manager.is_open():
+                    continue
                 try:
                     if manager.vision_pipeline and manager.use_case == "vision_pipeline":
                         if manager.process_vision_pipeline():
                             processed_any = True
                     else:
-                        # stream_only or apriltag: get raw, convert if apriltag, encode to JPEG
+                        # stream_only or apriltag: get raw, gray if apriltag (single-channel JPEG), encode
                         raw_frame = manager.get_raw_frame(timeout=0.0)
                         if raw_frame is not None:
                             processed_any = True
-                            if manager.use_case == "apriltag" and len(raw_frame.shape) == 3:
-                                gray = cv2.cvtColor(raw_frame, cv2.COLOR_BGR2GRAY)
-                                frame_to_encode = cv2.cvtColor(gray, cv2.COLOR_GRAY2BGR)
-                            else:
-                                frame_to_encode = raw_frame
-                            frame_data = encode_frame_to_jpeg(frame_to_encode, quality=85)
-                            if frame_data:
-                                with manager.frame_queue_lock:
-                                    manager.frame_queue.append(frame_data)
-                                with manager.metrics_lock:
-                                    manager.frames_captured += 1
-                                    manager.last_frame_time = time.time()
+                            if not manager.stream_subscribers:
+                                # Nobody is watching: take the frame off the queue, skip gray + encode
+                                continue
+                            frame = raw_frame
+                            if manager.preview_scale != 1.0:
+                                # Downscale before gray conversion/encode: both scale with pixel count
+                                frame = manager.scale_preview(frame)
+                            gray = manager.use_case == "apriltag"
+                            if gray and not fused_gray:
+                                frame = manager.to_grayscale(frame)
+                            if frame is raw_frame and not inline:
+                                # Still the capture ring slot: the capture thread keeps writing while the
+                                # rest of this pass runs, so a slow pass could lap the ring before encode
+                                frame = frame.copy()
+                            to_encode.append((camera_id, manager, frame, gray))
+                except Exception as e:
+                    if manager.error_log_due():
+                        prefix = self._consumer_error_prefixes.get(camera_id, "[CameraService] Consumer error: ")
+                        self.logger.error(prefix + str(e))
+            if to_encode:
+                try:
+                    encoded = encode_frames_to_jpeg(
+                        [frame for _, _, frame, _ in to_encode], quality=85,
+                        grayscale=[gray for _, _, _, gray in to_encode],
+                        executor=self._get_encode_pool(len(to_encode)) if len(to_encode) > 1 else None,
+                    )
                 except Exception as e:
-                    self.logger.error(f"[CameraService] Consumer error for {camera_id}: {e}")
-            if not processed_any:
-                time.sleep(0.01)
-        self.logger.info("[CameraService] Consumer loop stopped")
\ No newline at end of file
+                    self.logger.error(f"[CameraService] Encode error: {e}")
+                    encoded = []
+                # Capture metrics are recorded once, in enqueue_raw_frame(); only the JPEG is stored here
+                for (_, manager, _, _), frame_data in zip(to_encode, encoded):
+                    if frame_data:
+                        manager.frame_queue.append(frame_data)
+            return processed_any
@@ -1,7 +1,7 @@
 """Debug tree domain model."""
 
+import time
 from typing import Optional, List, Dict, Any
-from datetime import datetime
 from enum import Enum
 
 
@@ -13,9 +13,22 @@ class NodeStatus(Enum):
     ERROR = "ERROR"
 
 
+# Value -> member lookup for deserialization (plain dict hit instead of Enum.__call__)
+_STATUS_BY_VALUE: Dict[str, NodeStatus] = {s.value: s for s in NodeStatus}
+
+# Assigning any of these drops the node's cached to_dict() payload
+_SERIALIZED_FIELDS = frozenset(("id", "name", "status", "reason", "metrics", "children"))
+# Immutable fields compared by value on assignment; metrics/children are compared by identity
+_SCALAR_FIELDS = frozenset(("id", "name", "status", "reason"))
+_UNSET = object()
+
+
 class DebugTreeNode:
     """Represents a node in the debug tree."""
     
+    __slots__ = ("id", "name", "status", "status_value", "reason", "metrics", "children",
+                 "last_update", "_dict_cache")
+    
     def __init__(
         self,
         id: str,
@@ -31,30 +44,69 @@ class DebugTreeNode:
         self.reason = reason
         self.metrics = metrics or {}
         self.children = children or []
-        self.last_update = datetime.now()
+        self.last_update = time.monotonic()
+        self._dict_cache: Optional[Dict[str, Any]] = None
+    
+    def __setattr__(self, name: str, value: Any) -> None:
+        if name in _SERIALIZED_FIELDS:
+            old = getattr(self, name, _UNSET)
+            # Re-assigning an equal scalar, or the same metrics/children object, keeps the cached payload
+            if old is value or (name in _SCALAR_FIELDS and old == value):
+                object.__setattr__(self, name, value)
+                return
+            object.__setattr__(self, "_dict_cache", None)
+            if name == "status":
+                object.__setattr__(self, "status_value", value.value)
+        object.__setattr__(self, name, value)
     
     def to_dict(self) -> Dict[str, Any]:
-        """Convert node to dictionary."""
-        return {
+        """Convert node to dictionary.
+        
+        The result is cached and reused while the node and its subtree are unchanged,
+        so callers must treat it as read-only.
+        """
+        children = [child.to_dict() for child in self.children]
+        cache = self._dict_cache
+        if cache is not None:
+            cached_children = cache["children"]
+            if len(cached_children) == len(children) and all(
+                a is b for a, b in zip(cached_children, children)
+            ):
+                return cache
+        cache = {
             "id": self.id,
             "name": self.name,
-            "status": self.status.value,
+            "status": self.status_value,
             "reason": self.reason,
             "metrics": self.metrics,
-            "children": [child.to_dict() for child in self.children]
+            "children": children
         }
+        self._dict_cache = cache
+        return cache
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'DebugTreeNode':
-        """Create node from dictionary."""
-        children = [
-            cls.from_dict(child) for child in data.get("children", [])
-        ]
-        return cls(
-            id=data["id"],
-            name=data["name"],
-            status=NodeStatus(data["status"]),
-            reason=data["reason"],
-            metrics=data.get("metrics", {}),
-            children=children
-        )
+        """Create node from dictionary.
+        
+        Built iteratively (explicit stack, parents before children) so deep trees
+        don't hit the recursion limit.
+        """
+        status_by_value = _STATUS_BY_VALUE
+        root: Optional['DebugTreeNode'] = None
+        stack: List[tuple] = [(data, None)]
+        while stack:
+            item, parent = stack.pop()
+            node = cls(
+                id=item["id"],
+                name=item["name"],
+                status=status_by_value[item["status"]],
+                reason=item["reason"],
+                metrics=item.get("metrics", {}),
+            )
+            if parent is None:
+                root = node
+            else:
+                parent.children.append(node)
+            # Reversed so children are popped, and appended to node.children, in their original order
+            stack.extend((child, node) for child in reversed(item.get("children", [])))
+        return root
@@ -1,10 +1,147 @@
 """Debug tree manager for maintaining the debug tree state."""
 
-from typing import List, Optional, Dict, Any
+import copy
+import heapq
+import time
+from operator import itemgetter
+from typing import AbstractSet, Callable, List, Mapping, Optional, Dict, Any, Sequence, Tuple
 from .debug_tree import DebugTreeNode, NodeStatus
 from ..services.health_service import HealthService
 from ..services.logging_service import LoggingService
 
+# Metrics templates for nodes with nothing to report; nodes get a copy (metrics are updated in place)
+_NO_CAM_REASON = "No cameras open"
+_NO_CAM_METRICS: Dict[str, Any] = {"fps": 0.0, "latency": 0, "drops": 0, "frames_captured": 0, "lastUpdateAge": 5000}
+_CAMERA_OFFLINE_METRICS: Dict[str, Any] = {"fps": 0.0, "drops": 0, "frames_captured": 0, "lastUpdateAge": 5000}
+# Idle vision pipeline metrics; nodes get a copy, and only when not already idle (keeps cached to_dict output)
+_PIPELINE_IDLE_METRICS: Dict[str, Any] = {"fps": 0.0, "tags_detected": 0, "frames_processed": 0, "lastUpdateAge": 5000}
+_PREPROCESS_IDLE_METRICS: Dict[str, Any] = {"fps": 0.0, "lastUpdateAge": 5000}
+_DETECTION_IDLE_METRICS: Dict[str, Any] = {"fps": 0.0, "tags_detected": 0, "latency": 0, "lastUpdateAge": 5000}
+# Built-in children of camera_manager that are never pruned
+_CAMERA_MANAGER_FIXED_IDS = frozenset(("camera_discovery", "camera_capture"))
+# Built-in children of vision_pipeline that are never pruned
+_VISION_PIPELINE_FIXED_IDS = frozenset(("preprocess", "detection"))
+# Detached per-camera nodes kept for reuse when cameras reappear (flapping USB devices)
+_CAMERA_NODE_POOL_MAX = 8
+# Seconds between camera discovery queries from the debug tree
+_CAMERA_LIST_TTL_S = 2.0
+# get_tree_dict() reuses its last result this long while no camera captured a new frame
+_TREE_DICT_TTL_S = 0.25
+# get_top_faults() ordering: most severe first
+_SEVERITY: Dict[NodeStatus, int] = {NodeStatus.ERROR: 3, NodeStatus.STALE: 2, NodeStatus.WARN: 1, NodeStatus.OK: 0}
+# Capture metrics read per camera; CameraManager.get_metrics() always returns these keys
+_CAPTURE_METRICS = itemgetter("fps", "frames_dropped", "frames_captured", "last_frame_age")
+
+
+def _build_simulated_tree() -> DebugTreeNode:
+    """Create simulated debug tree for Stage 0."""
+    return DebugTreeNode(
+        id="root",
+        name="System",
+        status=NodeStatus.OK,
+        reason="All systems operational",
+        metrics={"fps": 30.0, "latency": 16},
+        children=[
+            DebugTreeNode(
+                id="camera_manager",
+                name="Camera Manager",
+                status=NodeStatus.OK,
+                reason="Running",
+                metrics={
+                    "fps": 30.0,
+                    "latency": 2,
+                    "drops": 0,
+                    "lastUpdateAge": 16
+                },
+                children=[
+                    DebugTreeNode(
+                        id="camera_discovery",
+                        name="Camera Discovery",
+                        status=NodeStatus.OK,
+                        reason="2 cameras found",
+                        metrics={"lastUpdateAge": 1000}
+                    ),
+                    DebugTreeNode(
+                        id="camera_capture",
+                        name="Camera Capture",
+                        status=NodeStatus.OK,
+                        reason="Streaming",
+                        metrics={
+                            "fps": 30.0,
+                            "latency": 1,
+                            "drops": 0,
+                            "frames_captured": 0,
+                            "lastUpdateAge": 16
+                        }
+                    )
+                ]
+            ),
+            DebugTreeNode(
+                id="vision_pipeline",
+                name="Vision Pipeline",
+                status=NodeStatus.WARN,
+                reason="No camera open",
+                metrics={
+                    "fps": 0.0,
+                    "latency": 0,
+                    "lastUpdateAge": 5000
+                },
+                children=[
+                    DebugTreeNode(
+                        id="preprocess",
+                        name="Preprocess",
+                        status=NodeStatus.STALE,
+                        reason="No input",
+                        metrics={
+                            "fps": 0.0,
+                            "lastUpdateAge": 5000
+                        }
+                    ),
+                    DebugTreeNode(
+                        id="detection",
+                        name="Tag Detection",
+                        status=NodeStatus.STALE,
+                        reason="No input",
+                        metrics={
+                            "fps": 0.0,
+                            "latency": 0,
+                            "lastUpdateAge": 5000
+                        }
+                    )
+                ]
+            ),
+            DebugTreeNode(
+                id="webserver",
+                name="Web Server",
+                status=NodeStatus.OK,
+                reason="Listening on :8080",
+                metrics={"lastUpdateAge": 0}
+            )
+        ]
+    )
+
+
+def _camera_columns(camera_list: List[Dict[str, Any]]) -> Tuple[List[str], List[str]]:
+    """Split get_camera_list() output into parallel (ids, display names)."""
+    ids = [camera.get("id") or "" for camera in camera_list]
+    names = [
+        camera.get("custom_name") or camera.get("name", camera_id)
+        for camera, camera_id in zip(camera_list, ids)
+    ]
+    return ids, names
+
+
+def _prune_children(node: DebugTreeNode, keep_ids: AbstractSet[str]) -> None:
+    """Delete children whose id is not in keep_ids, in place (the children list is kept, not rebuilt)."""
+    children = node.children
+    stale = [i for i, child in enumerate(children) if child.id not in keep_ids]
+    for i in reversed(stale):
+        del children[i]
+
+
+# Built once; each manager deep-copies it (metrics are updated in place per instance)
+_SIMULATED_TREE_TEMPLATE = _build_simulated_tree()
+
 
 class DebugTreeManager:
     """Manages the debug tree with simulated nodes."""
@@ -14,262 +151,215 @@ class DebugTreeManager:
         health_service: HealthService,
         logger: LoggingService,
         camera_service=None,
-        camera_discovery=None
+        camera_discovery=None,
+        camera_list_ttl: float = _CAMERA_LIST_TTL_S
     ):
         self.health_service = health_service
         self.logger = logger
         self.camera_service = camera_service
         self.camera_discovery = camera_discovery
         self.root_node = self._create_simulated_tree()
+        # Fixed topology: resolve the well-known nodes once instead of scanning children per poll
+        self._camera_manager_node = self._find_child(self.root_node, "camera_manager")
+        self._camera_capture_node = self._find_child(self._camera_manager_node, "camera_capture")
+        self._vision_pipeline_node = self._find_child(self.root_node, "vision_pipeline")
+        self._preprocess_node = self._find_child(self._vision_pipeline_node, "preprocess")
+        self._detection_node = self._find_child(self._vision_pipeline_node, "detection")
+        # Per-camera nodes under camera_manager by id, kept in step with its children list
+        self._camera_nodes_by_id: Dict[str, DebugTreeNode] = {}
+        self._last_detected_ids: Optional[frozenset] = None
+        self._camera_node_pool: List[DebugTreeNode] = []
+        # Last get_tree_dict() result, its camera state key and when it was built (see _tree_state_key)
+        self._last_dict: Optional[Dict[str, Any]] = None
+        self._last_state_key: Optional[tuple] = None
+        self._last_emit_ts = 0.0
+        # Detected camera columns reused for camera_list_ttl seconds (0 = query discovery every poll)
+        self.camera_list_ttl = camera_list_ttl
+        self._cam_list_cache: Optional[Tuple[Sequence[str], Sequence[str]]] = None
+        self._cam_list_ts = 0.0
+        # Column reader bound to the current camera_discovery (see _resolve_camera_fetch)
+        self._fetch_owner = None
+        self._fetch_columns: Optional[Callable[[], Tuple[Sequence[str], Sequence[str]]]] = None
+    
+    @staticmethod
+    def _find_child(node: Optional[DebugTreeNode], child_id: str) -> Optional[DebugTreeNode]:
+        """Return the direct child with the given id, or None."""
+        if node is None:
+            return None
+        return next((child for child in node.children if child.id == child_id), None)
     
     def _create_simulated_tree(self) -> DebugTreeNode:
-        """Create simulated debug tree for Stage 0."""
-        return DebugTreeNode(
-            id="root",
-            name="System",
-            status=NodeStatus.OK,
-            reason="All systems operational",
-            metrics={"fps": 30.0, "latency": 16},
-            children=[
-                DebugTreeNode(
-                    id="camera_manager",
-                    name="Camera Manager",
-                    status=NodeStatus.OK,
-                    reason="Running",
-                    metrics={
-                        "fps": 30.0,
-                        "latency": 2,
-                        "drops": 0,
-                        "lastUpdateAge": 16
-                    },
-                    children=[
-                        DebugTreeNode(
-                            id="camera_discovery",
-                            name="Camera Discovery",
-                            status=NodeStatus.OK,
-                            reason="2 cameras found",
-                            metrics={"lastUpdateAge": 1000}
-                        ),
-                        DebugTreeNode(
-                            id="camera_capture",
-                            name="Camera Capture",
-                            status=NodeStatus.OK,
-                            reason="Streaming",
-                            metrics={
-                                "fps": 30.0,
-                                "latency": 1,
-                                "drops": 0,
-                                "lastUpdateAge": 16
-                            }
-                        )
-                    ]
-                ),
-                DebugTreeNode(
-                    id="vision_pipeline",
-                    name="Vision Pipeline",
-                    status=NodeStatus.WARN,
-                    reason="No camera open",
-                    metrics={
-                        "fps": 0.0,
-                        "latency": 0,
-                        "lastUpdateAge": 5000
-                    },
-                    children=[
-                        DebugTreeNode(
-                            id="preprocess",
-                            name="Preprocess",
-                            status=NodeStatus.STALE,
-                            reason="No input",
-                            metrics={
-                                "fps": 0.0,
-                                "lastUpdateAge": 5000
-                            }
-                        ),
-                        DebugTreeNode(
-                            id="detection",
-                            name="Tag Detection",
-                            status=NodeStatus.STALE,
-                            reason="No input",
-                            metrics={
-                                "fps": 0.0,
-                                "latency": 0,
-                                "lastUpdateAge": 5000
-                            }
-                        )
-                    ]
-                ),
-                DebugTreeNode(
-                    id="webserver",
-                    name="Web Server",
-                    status=NodeStatus.OK,
-                    reason="Listening on :8080",
-                    metrics={"lastUpdateAge": 0}
-                )
-            ]
-        )
+        """Create simulated debug tree for Stage 0 (a private copy of the module template)."""
+        return copy.deepcopy(_SIMULATED_TREE_TEMPLATE)
     
     def get_tree(self) -> DebugTreeNode:
         """Get the current debug tree with updated camera status."""
-        # Update camera capture node with real metrics
-        camera_manager_node = None
-        camera_capture_node = None
+        if self.camera_service is None and self.camera_discovery is None:
+            # Purely simulated tree: nothing below would change it
+            return self.root_node
         
-        # Find camera_manager and camera_capture nodes
-        for child in self.root_node.children:
-            if child.id == "camera_manager":
-                camera_manager_node = child
-                for subchild in child.children:
-                    if subchild.id == "camera_capture":
-                        camera_capture_node = subchild
-                        break
-                break
+        # Update camera capture node with real metrics (well-known nodes resolved in __init__)
+        camera_manager_node = self._camera_manager_node
+        camera_capture_node = self._camera_capture_node
+        
+        # Camera managers and open-camera metrics fetched once per poll and shared by the updates below
+        if self.camera_service:
+            managers = self.camera_service.get_all_camera_managers()
+            open_metrics = {
+                camera_id: metrics
+                for camera_id, is_open, metrics in self.camera_service.get_all_camera_snapshots()
+                if is_open
+            }
+        else:
+            managers, open_metrics = {}, {}
+        # Detected cameras as parallel id/name columns (discovery is queried at most every camera_list_ttl)
+        detected = self._detected_camera_columns()
         
         # Add/update individual camera nodes
         if camera_manager_node:
-            self._update_camera_nodes(camera_manager_node)
+            self._update_camera_nodes(camera_manager_node, detected, open_metrics)
         
         # Update vision pipeline node with real metrics
-        vision_pipeline_node = None
-        for child in self.root_node.children:
-            if child.id == "vision_pipeline":
-                vision_pipeline_node = child
-                break
-        
+        vision_pipeline_node = self._vision_pipeline_node
         if vision_pipeline_node:
-            self._update_vision_pipeline_node(vision_pipeline_node)
+            self._update_vision_pipeline_node(vision_pipeline_node, managers, open_metrics, detected)
         
         # Update camera_capture node with real metrics if camera service available
         if camera_capture_node and self.camera_service:
-            managers = self.camera_service.get_all_camera_managers()
-            if managers:
-                # Aggregate metrics from all open cameras
-                total_fps = 0.0
-                total_drops = 0
-                total_frames = 0
-                max_age = 0.0
-                open_count = 0
-                
-                for camera_id, manager in managers.items():
-                    if manager.is_open():
-                        metrics = manager.get_metrics()
-                        total_fps += metrics.get("fps", 0.0)
-                        total_drops += metrics.get("frames_dropped", 0)
-                        total_frames += metrics.get("frames_captured", 0)
-                        age = metrics.get("last_frame_age", 0.0)  # Already in milliseconds
-                        if age > max_age:
-                            max_age = age
-                        open_count += 1
-                
-                if open_count > 0:
-                    camera_capture_node.status = NodeStatus.OK
-                    camera_capture_node.reason = f"{open_count} camera(s) streaming"
-                    camera_capture_node.metrics = {
-                        "fps": round(total_fps / open_count, 1),
-                        "latency": 1,
-                        "drops": total_drops,
-                        "frames_captured": total_frames,  # Add total frames captured
-                        "lastUpdateAge": int(max_age)  # Already in milliseconds, don't multiply
-                    }
-                else:
-                    camera_capture_node.status = NodeStatus.WARN
-                    camera_capture_node.reason = "No cameras open"
-                    camera_capture_node.metrics = {
-                        "fps": 0.0,
-                        "latency": 0,
-                        "drops": 0,
-                        "lastUpdateAge": 5000
-                    }
+            open_count = len(open_metrics)
+            total_fps = 0.0
+            total_drops = total_frames = max_age = 0
+            for metrics in open_metrics.values():
+                fps, drops, frames, age = _CAPTURE_METRICS(metrics)
+                total_fps += fps
+                total_drops += drops
+                total_frames += frames
+                if age > max_age:
+                    max_age = age  # Already in milliseconds
+            if open_count:
+                camera_capture_node.status = NodeStatus.OK
+                camera_capture_node.reason = f"{open_count} camera(s) streaming"
+                # Same keys every poll (seeded in _build_simulated_tree): update in place
+                m = camera_capture_node.metrics
+                m["fps"] = round(total_fps / open_count, 1)
+                m["latency"] = 1
+                m["drops"] = total_drops
+                m["frames_captured"] = total_frames
+                m["lastUpdateAge"] = int(max_age)  # Already in milliseconds, don't multiply
             else:
-                camera_capture_node.status = NodeStatus.WARN
-                camera_capture_node.reason = "No cameras open"
-                camera_capture_node.metrics = {
-                    "fps": 0.0,
-                    "latency": 0,
-                    "drops": 0,
-                    "lastUpdateAge": 5000
-                }
+                self._set_no_cameras(camera_capture_node)
         
         return self.root_node
     
-    def _update_camera_nodes(self, camera_manager_node: DebugTreeNode) -> None:
-        """Add or update individual camera nodes under camera_manager."""
-        # Get list of detected cameras
-        detected_cameras = []
-        if self.camera_discovery:
-            try:
-                camera_list = self.camera_discovery.get_camera_list()
-                # get_camera_list() returns a list directly, not a dict with "cameras" key
-                if isinstance(camera_list, list):
-                    detected_cameras = camera_list
-                elif isinstance(camera_list, dict):
-                    detected_cameras = camera_list.get("cameras", [])
-            except Exception as e:
-                self.logger.warning(f"[DebugTree] Failed to get camera list for debug tree: {e}")
-        
-        # Get camera managers for open cameras
-        camera_managers = {}
-        if self.camera_service:
-            camera_managers = self.camera_service.get_all_camera_managers()
+    @staticmethod
+    def _set_no_cameras(node: DebugTreeNode) -> None:
+        """Mark the capture node as idle (no open cameras)."""
+        node.status = NodeStatus.WARN
+        node.reason = _NO_CAM_REASON
+        node.metrics.update(_NO_CAM_METRICS)
+    
+    def _detected_camera_columns(self) -> Tuple[Sequence[str], Sequence[str]]:
+        """Detected camera (ids, display names), refreshed from discovery at most every camera_list_ttl seconds."""
+        now = time.monotonic()
+        if self._cam_list_cache is None or now - self._cam_list_ts >= self.camera_list_ttl:
+            self._cam_list_cache = self._query_camera_columns()
+            self._cam_list_ts = now
+        return self._cam_list_cache
+    
+    def _query_camera_columns(self) -> Tuple[Sequence[str], Sequence[str]]:
+        """Detected camera (ids, display names) as parallel sequences; empty when discovery is unavailable."""
+        discovery = self.camera_discovery
+        if not discovery:
+            return (), ()
+        try:
+            # Resolved once per discovery object (it is attached after construction)
+            if self._fetch_owner is not discovery:
+                self._fetch_columns = self._resolve_camera_fetch(discovery)
+                self._fetch_owner = discovery
+            return self._fetch_columns()
+        except Exception as e:
+            self.logger.warning(f"[DebugTree] Failed to get camera list for debug tree: {e}")
+            return (), ()
+    
+    @staticmethod
+    def _resolve_camera_fetch(discovery) -> Callable[[], Tuple[Sequence[str], Sequence[str]]]:
+        """Pick how to read (ids, names) from this discovery backend; its return shape is probed once."""
+        get_columns = getattr(discovery, "get_camera_columns", None)
+        if get_columns is not None:
+            return get_columns
+        get_camera_list = discovery.get_camera_list
+        if isinstance(get_camera_list(), dict):
+            return lambda: _camera_columns(get_camera_list().get("cameras", []))
+        return lambda: _camera_columns(get_camera_list())
+    
+    def _update_camera_nodes(
+        self,
+        camera_manager_node: DebugTreeNode,
+        detected: Tuple[Sequence[str], Sequence[str]],
+        open_metrics: Mapping[str, Dict[str, Any]]
+    ) -> None:
+        """Add or update individual camera nodes under camera_manager.
         
-        # Create a set of camera IDs that should be in the tree
-        camera_ids_in_tree = set()
-        for camera in detected_cameras:
-            camera_ids_in_tree.add(camera.get("id", ""))
+        detected: (ids, display names) of detected cameras; open_metrics: get_metrics() of open cameras by id.
+        """
+        detected_ids, detected_names = detected
+        if not detected_ids and not self._last_detected_ids:
+            # No cameras now or at the last prune: no camera nodes to add, update or remove
+            return
         
-        # Remove camera nodes that are no longer detected
-        camera_manager_node.children = [
-            child for child in camera_manager_node.children 
-            if not child.id.startswith("camera_") or child.id in ["camera_discovery", "camera_capture"] or child.id in camera_ids_in_tree
-        ]
+        # Camera IDs that should be in the tree; prune only when the detected set changed
+        camera_ids_in_tree = frozenset(detected_ids)
+        camera_nodes_by_id = self._camera_nodes_by_id
+        if camera_ids_in_tree != self._last_detected_ids:
+            # Remove camera nodes that are no longer detected (camera IDs are usb-*/video*, so match by set)
+            keepers = _CAMERA_MANAGER_FIXED_IDS | camera_ids_in_tree
+            _prune_children(camera_manager_node, keepers)
+            pool = self._camera_node_pool
+            for camera_id, node in camera_nodes_by_id.items():
+                if camera_id not in camera_ids_in_tree and len(pool) < _CAMERA_NODE_POOL_MAX:
+                    node.children.clear()
+                    pool.append(node)
+            camera_nodes_by_id = self._camera_nodes_by_id = {
+                camera_id: node for camera_id, node in camera_nodes_by_id.items() if camera_id in camera_ids_in_tree
+            }
+            self._last_detected_ids = camera_ids_in_tree
         
         # Add or update camera nodes
-        for camera in detected_cameras:
-            camera_id = camera.get("id", "")
+        status_ok, status_warn = NodeStatus.OK, NodeStatus.WARN
+        for camera_id, camera_name in zip(detected_ids, detected_names):
             if not camera_id:
                 continue
             
             # Find existing camera node
-            camera_node = None
-            for child in camera_manager_node.children:
-                if child.id == camera_id:
-                    camera_node = child
-                    break
-            
-            # Get camera name
-            camera_name = camera.get("name", camera_id)
-            if camera.get("custom_name"):
-                camera_name = camera.get("custom_name")
+            camera_node = camera_nodes_by_id.get(camera_id)
             
             # Get camera status
-            is_open = camera_id in camera_managers and camera_managers[camera_id].is_open()
-            status = NodeStatus.OK if is_open else NodeStatus.WARN
+            manager_metrics = open_metrics.get(camera_id)
+            is_open = manager_metrics is not None
+            status = status_ok if is_open else status_warn
             reason = "Open and streaming" if is_open else "Not open"
             
-            # Get camera metrics if open
-            metrics = {}
+            # Camera metrics (same keys open or not); existing nodes are updated in place
+            if camera_node is None and self._camera_node_pool:
+                # Reuse a detached node: same keys are rewritten below, identity fields reset here
+                camera_node = self._camera_node_pool.pop()
+                camera_node.id = camera_id
+                camera_node.last_update = time.monotonic()
+                camera_manager_node.children.append(camera_node)
+                camera_nodes_by_id[camera_id] = camera_node
+            metrics = camera_node.metrics if camera_node else {}
             if is_open:
-                manager = camera_managers[camera_id]
-                manager_metrics = manager.get_metrics()
-                metrics = {
-                    "fps": manager_metrics.get("fps", 0.0),
-                    "drops": manager_metrics.get("frames_dropped", 0),
-                    "frames_captured": manager_metrics.get("frames_captured", 0),
-                    "lastUpdateAge": manager_metrics.get("last_frame_age", 0)
-                }
+                (
+                    metrics["fps"], metrics["drops"], metrics["frames_captured"], metrics["lastUpdateAge"]
+                ) = _CAPTURE_METRICS(manager_metrics)
             else:
-                metrics = {
-                    "fps": 0.0,
-                    "drops": 0,
-                    "frames_captured": 0,
-                    "lastUpdateAge": 5000
-                }
+                metrics.update(_CAMERA_OFFLINE_METRICS)
             
             # Create or update camera node
             if camera_node:
                 camera_node.name = camera_name
                 camera_node.status = status
                 camera_node.reason = reason
-                camera_node.metrics = metrics
             else:
                 # Insert camera nodes before camera_discovery and camera_capture
                 camera_node = DebugTreeNode(
@@ -281,24 +371,31 @@ class DebugTreeManager:
                 )
                 # Insert at the end, after camera_discovery and camera_capture
                 camera_manager_node.children.append(camera_node)
+                camera_nodes_by_id[camera_id] = camera_node
     
-    def _update_vision_pipeline_node(self, vision_pipeline_node: DebugTreeNode) -> None:
-        """Update vision pipeline node with per-camera pipeline metrics."""
+    def _update_vision_pipeline_node(
+        self,
+        vision_pipeline_node: DebugTreeNode,
+        managers: Mapping[str, Any],
+        open_metrics: Mapping[str, Dict[str, Any]],
+        detected: Tuple[Sequence[str], Sequence[str]]
+    ) -> None:
+        """Update vision pipeline node with per-camera pipeline metrics (inputs fetched once in get_tree)."""
         if not self.camera_service:
             return
         
-        # Get all camera managers
-        managers = self.camera_service.get_all_camera_managers()
-        
         # Find cameras with vision pipelines
         pipeline_cameras = []
         total_preprocess_fps = 0.0
         total_tags_detected = 0
         total_frames_processed = 0
         active_pipeline_count = 0
+        # Display names of detected cameras by id (custom name applied), built once per refresh
+        names_by_id = dict(zip(*detected))
         
         for camera_id, manager in managers.items():
-            if manager.is_open() and hasattr(manager, 'vision_pipeline') and manager.vision_pipeline:
+            camera_metrics = open_metrics.get(camera_id)
+            if camera_metrics is not None and getattr(manager, 'vision_pipeline', None):
                 pipeline = manager.vision_pipeline
                 metrics = pipeline.get_metrics()
                 
@@ -308,7 +405,6 @@ class DebugTreeManager:
                 
                 # Estimate FPS from frames_processed (assuming ~30fps processing)
                 # This is approximate - we could track timing if needed
-                camera_metrics = manager.get_metrics()
                 camera_fps = camera_metrics.get("fps", 0.0)
                 preprocess_fps = camera_fps  # Preprocess FPS matches camera FPS
                 
@@ -318,16 +414,7 @@ class DebugTreeManager:
                 active_pipeline_count += 1
                 
                 # Get camera name
-                camera_name = camera_id
-                if self.camera_discovery:
-                    try:
-                        cameras = self.camera_discovery.get_camera_list()
-                        for cam in cameras:
-                            if cam.get("id") == camera_id:
-                                camera_name = cam.get("custom_name") or cam.get("name", camera_id)
-                                break
-                    except:
-                        pass
+                camera_name = names_by_id.get(camera_id, camera_id)
                 
                 pipeline_cameras.append({
                     "camera_id": camera_id,
@@ -352,21 +439,12 @@ class DebugTreeManager:
         else:
             vision_pipeline_node.status = NodeStatus.OK  # OK when no cameras, not WARN
             vision_pipeline_node.reason = "No cameras with pipeline open"
-            vision_pipeline_node.metrics = {
-                "fps": 0.0,
-                "tags_detected": 0,
-                "frames_processed": 0,
-                "lastUpdateAge": 5000
-            }
+            if vision_pipeline_node.metrics != _PIPELINE_IDLE_METRICS:
+                vision_pipeline_node.metrics = dict(_PIPELINE_IDLE_METRICS)
         
-        # Update preprocess and detection child nodes
-        preprocess_node = None
-        detection_node = None
-        for child in vision_pipeline_node.children:
-            if child.id == "preprocess":
-                preprocess_node = child
-            elif child.id == "detection":
-                detection_node = child
+        # Update preprocess and detection child nodes (resolved in __init__)
+        preprocess_node = self._preprocess_node
+        detection_node = self._detection_node
         
         # Update preprocess node
         if preprocess_node:
@@ -381,10 +459,8 @@ class DebugTreeManager:
             else:
                 preprocess_node.status = NodeStatus.STALE
                 preprocess_node.reason = "No input"
-                preprocess_node.metrics = {
-                    "fps": 0.0,
-                    "lastUpdateAge": 5000
-                }
+                if preprocess_node.metrics != _PREPROCESS_IDLE_METRICS:
+                    preprocess_node.metrics = dict(_PREPROCESS_IDLE_METRICS)
         
         # Update detection node
         if detection_node:
@@ -400,19 +476,18 @@ class DebugTreeManager:
             else:
                 detection_node.status = NodeStatus.STALE
                 detection_node.reason = "No input"
-                detection_node.metrics = {
-                    "fps": 0.0,
-                    "tags_detected": 0,
-                    "latency": 0,
-                    "lastUpdateAge": 5000
-                }
+                if detection_node.metrics != _DETECTION_IDLE_METRICS:
+                    detection_node.metrics = dict(_DETECTION_IDLE_METRICS)
         
         # Create/update per-camera pipeline nodes
         # Remove old pipeline camera nodes that no longer exist
-        vision_pipeline_node.children = [
-            child for child in vision_pipeline_node.children 
-            if child.id in ["preprocess", "detection"] or any(p["camera_id"] == child.id for p in pipeline_cameras)
-        ]
+        pipeline_ids = {p["camera_id"] for p in pipeline_cameras}
+        _prune_children(vision_pipeline_node, _VISION_PIPELINE_FIXED_IDS | pipeline_ids)
+        # Existing per-camera pipeline nodes by id (first match wins, as with a scan)
+        existing: Dict[str, DebugTreeNode] = {}
+        for child in vision_pipeline_node.children:
+            if child.id in pipeline_ids:
+                existing.setdefault(child.id, child)
         
         # Add/update per-camera pipeline nodes
         for pipeline_data in pipeline_cameras:
@@ -420,11 +495,7 @@ class DebugTreeManager:
             camera_name = pipeline_data["camera_name"]
             
             # Find existing pipeline camera node
-            pipeline_camera_node = None
-            for child in vision_pipeline_node.children:
-                if child.id == camera_id:
-                    pipeline_camera_node = child
-                    break
+            pipeline_camera_node = existing.get(camera_id)
             
             if pipeline_camera_node:
                 # Update existing node
@@ -456,30 +527,67 @@ class DebugTreeManager:
     def get_top_faults(self, max_faults: int = 5) -> List[Dict[str, Any]]:
         """Collect nodes with status != OK from the tree, ordered by severity (ERROR > STALE > WARN)."""
         root = self.get_tree()
-        faults: List[Dict[str, Any]] = []
-
-        def severity_order(status: NodeStatus) -> int:
-            order = {NodeStatus.ERROR: 3, NodeStatus.STALE: 2, NodeStatus.WARN: 1, NodeStatus.OK: 0}
-            return order.get(status, 0)
-
-        def walk(node: DebugTreeNode, path_parts: List[str]) -> None:
-            path = " > ".join(path_parts) if path_parts else node.name
-            if node.status != NodeStatus.OK:
-                faults.append({
-                    "path": path,
-                    "node_id": node.id,
-                    "name": node.name,
-                    "status": node.status.value,
-                    "reason": node.reason,
-                    "metrics": node.metrics or {},
-                })
-            for child in node.children:
-                walk(child, path_parts + [child.name])
+        if max_faults <= 0:
+            return []
+        # (severity, path, node) in pre-order; nlargest is stable, so tree order is kept within a severity.
+        # Fault dicts are built only for the max_faults survivors.
+        faults: List[Tuple[int, str, DebugTreeNode]] = []
+        status_ok = NodeStatus.OK
+        max_severity = _SEVERITY[NodeStatus.ERROR]
+        error_count = 0
+        # (node, "Root > ... > Node" path), each path built once from its parent's
+        stack = [(root, root.name)]
+        while stack:
+            node, path = stack.pop()
+            if node.status != status_ok:
+                severity = _SEVERITY.get(node.status, 0)
+                faults.append((severity, path, node))
+                if severity == max_severity:
+                    error_count += 1
+                    if error_count == max_faults:
+                        # max_faults ERRORs found: nothing later in pre-order can displace them
+                        break
+            # Reversed so children pop in order
+            for child in reversed(node.children):
+                stack.append((child, f"{path} > {child.name}"))
 
-        walk(root, [root.name])
-        faults.sort(key=lambda f: severity_order(NodeStatus(f["status"])), reverse=True)
-        return faults[:max_faults]
+        return [
+            {
+                "path": path,
+                "node_id": node.id,
+                "name": node.name,
+                "status": node.status_value,
+                "reason": node.reason,
+                "metrics": node.metrics or {},
+            }
+            for _, path, node in heapq.nlargest(max_faults, faults, key=itemgetter(0))
+        ]
 
+    def _tree_state_key(self) -> tuple:
+        """Cheap summary of camera state: (id, open, frames captured, has pipeline) per camera manager."""
+        if not self.camera_service:
+            return ()
+        return tuple(
+            (camera_id, manager.is_open(), manager.frames_captured, manager.vision_pipeline is not None)
+            for camera_id, manager in self.camera_service.get_all_camera_managers().items()
+        )
+    
     def get_tree_dict(self) -> dict:
-        """Get debug tree as dictionary."""
-        return self.get_tree().to_dict()
+        """Get debug tree as dictionary.
+        
+        Polls within _TREE_DICT_TTL_S of the last build reuse it while no camera has a new frame;
+        discovery/name changes show up once the TTL lapses.
+        """
+        now = time.monotonic()
+        key = self._tree_state_key()
+        if (
+            self._last_dict is not None
+            and key == self._last_state_key
+            and now - self._last_emit_ts < _TREE_DICT_TTL_S
+        ):
+            return self._last_dict
+        tree_dict = self.get_tree().to_dict()
+        self._last_dict = tree_dict
+        self._last_state_key = key
+        self._last_emit_ts = now
+        return tree_dict
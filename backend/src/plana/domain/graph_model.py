@@ -6,11 +6,12 @@ Data structures and validation:
 - Single-source validation (exactly one source, all reachable)
 """
 
+from collections import Counter, deque
 from typing import Dict, List, Optional, Set, Tuple
 from dataclasses import dataclass, field
 
 
-@dataclass
+@dataclass(slots=True)
 class GraphNode:
     """A node in the pipeline graph."""
     id: str
@@ -22,7 +23,7 @@ class GraphNode:
     ports: Optional[Dict] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class GraphEdge:
     """An edge (wire) between nodes."""
     id: str
@@ -32,43 +33,105 @@ class GraphEdge:
     target_port: str
 
 
-@dataclass
+@dataclass(slots=True)
 class PipelineGraph:
-    """Pipeline graph: nodes and edges."""
-    nodes: List[GraphNode] = field(default_factory=list)
-    edges: List[GraphEdge] = field(default_factory=list)
+    """Pipeline graph: nodes and edges.
+
+    nodes/edges are stored as tuples (lists are converted on construction and assignment), so the
+    cached indexes are keyed on identity alone: assign new sequences to change the graph, and call
+    invalidate() after editing a node or edge in place.
+    """
+    nodes: Tuple[GraphNode, ...] = ()
+    edges: Tuple[GraphEdge, ...] = ()
     layout: Optional[Dict[str, Dict[str, float]]] = None
     name: Optional[str] = None
+    # Node lookup indexes, rebuilt when the nodes tuple is replaced (see _rebuild_indexes)
+    _by_id: Dict[str, GraphNode] = field(default_factory=dict, init=False, repr=False, compare=False)
+    _sources: List[GraphNode] = field(default_factory=list, init=False, repr=False, compare=False)
+    _sinks: List[GraphNode] = field(default_factory=list, init=False, repr=False, compare=False)
+    _indexed_nodes: Optional[Tuple[GraphNode, ...]] = field(default=None, init=False, repr=False, compare=False)
+    # Adjacency maps memoized by _outgoing()/_incoming(); dropped when nodes or edges change (see _adjacency_valid)
+    _outgoing_cache: Optional[Dict[str, List[str]]] = field(default=None, init=False, repr=False, compare=False)
+    _incoming_cache: Optional[Dict[str, List[str]]] = field(default=None, init=False, repr=False, compare=False)
+    _adjacency_key: Optional[Tuple[Tuple[GraphNode, ...], Tuple[GraphEdge, ...]]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    def __setattr__(self, name: str, value) -> None:
+        if name == "nodes" or name == "edges":
+            value = tuple(value)
+        object.__setattr__(self, name, value)
+
+    def _rebuild_indexes(self) -> None:
+        """Index nodes by id (first wins on duplicate ids) and collect sources/sinks."""
+        by_id: Dict[str, GraphNode] = {}
+        sources: List[GraphNode] = []
+        sinks: List[GraphNode] = []
+        for n in self.nodes:
+            by_id.setdefault(n.id, n)
+            if n.type == "source":
+                sources.append(n)
+            elif n.type == "sink":
+                sinks.append(n)
+        self._by_id, self._sources, self._sinks = by_id, sources, sinks
+        self._indexed_nodes = self.nodes
+
+    def _ensure_indexes(self) -> None:
+        if self._indexed_nodes is not self.nodes:
+            self._rebuild_indexes()
 
     def get_node(self, node_id: str) -> Optional[GraphNode]:
         """Get node by id."""
-        for n in self.nodes:
-            if n.id == node_id:
-                return n
-        return None
+        self._ensure_indexes()
+        return self._by_id.get(node_id)
 
     def get_sources(self) -> List[GraphNode]:
-        """Get all source nodes."""
-        return [n for n in self.nodes if n.type == "source"]
+        """Get all source nodes (shared list; do not mutate)."""
+        self._ensure_indexes()
+        return self._sources
 
     def get_sinks(self) -> List[GraphNode]:
-        """Get all sink nodes."""
-        return [n for n in self.nodes if n.type == "sink"]
+        """Get all sink nodes (shared list; do not mutate)."""
+        self._ensure_indexes()
+        return self._sinks
+
+    def invalidate(self) -> None:
+        """Drop cached indexes and adjacency maps (after editing nodes/edges in place)."""
+        self._indexed_nodes = None
+        self._adjacency_key = None
+        self._outgoing_cache = None
+        self._incoming_cache = None
+
+    def _adjacency_valid(self) -> bool:
+        """True while the memoized adjacency maps match the current nodes/edges tuples."""
+        key = self._adjacency_key
+        if key is not None and key[0] is self.nodes and key[1] is self.edges:
+            return True
+        self._adjacency_key = (self.nodes, self.edges)
+        self._outgoing_cache = None
+        self._incoming_cache = None
+        return False
 
     def _outgoing(self) -> Dict[str, List[str]]:
-        """Map node_id -> list of target node_ids (outgoing edges)."""
+        """Map node_id -> list of target node_ids (outgoing edges). Memoized; do not mutate."""
+        if self._adjacency_valid() and self._outgoing_cache is not None:
+            return self._outgoing_cache
         out: Dict[str, List[str]] = {n.id: [] for n in self.nodes}
         for e in self.edges:
             if e.source_node in out:
                 out[e.source_node].append(e.target_node)
+        self._outgoing_cache = out
         return out
 
     def _incoming(self) -> Dict[str, List[str]]:
-        """Map node_id -> list of source node_ids (incoming edges)."""
+        """Map node_id -> list of source node_ids (incoming edges). Memoized; do not mutate."""
+        if self._adjacency_valid() and self._incoming_cache is not None:
+            return self._incoming_cache
         inc: Dict[str, List[str]] = {n.id: [] for n in self.nodes}
         for e in self.edges:
             if e.target_node in inc:
                 inc[e.target_node].append(e.source_node)
+        self._incoming_cache = inc
         return inc
 
 
@@ -79,77 +142,120 @@ class GraphValidationError(Exception):
         self.errors = errors or [message]
 
 
-def validate_dag(graph: PipelineGraph) -> Tuple[bool, List[str]]:
+def _walk_dag(
+    node_ids: Set[str], outgoing: Dict[str, List[str]], start: Optional[str] = None
+) -> Tuple[Optional[str], Set[str]]:
+    """
+    Iterative three-color DFS over the graph (no recursion limit on deep pipelines).
+    With start, that node is walked first and fully, so its reachable set is exact.
+    Returns (node that closed the first cycle found or None, nodes reachable from start).
+    """
+    WHITE, GRAY, BLACK = 0, 1, 2
+    color: Dict[str, int] = dict.fromkeys(node_ids, WHITE)
+    cycle_node: Optional[str] = None
+    reachable: Set[str] = set()
+    roots = node_ids if start is None else [start, *node_ids]
+
+    for root in roots:
+        if color[root] != WHITE:
+            continue
+        if cycle_node is not None:
+            # Past the start walk: one cycle is enough
+            break
+        from_start = root == start and not reachable
+        color[root] = GRAY
+        if from_start:
+            reachable.add(root)
+        stack = [(root, iter(outgoing.get(root, ())))]
+        while stack:
+            nid, children = stack[-1]
+            target = next(children, None)
+            if target is None:
+                color[nid] = BLACK
+                stack.pop()
+            elif target in node_ids:
+                target_color = color[target]
+                if target_color == GRAY:
+                    if cycle_node is None:
+                        cycle_node = target
+                    if not from_start:
+                        return cycle_node, reachable
+                elif target_color == WHITE:
+                    color[target] = GRAY
+                    if from_start:
+                        reachable.add(target)
+                    stack.append((target, iter(outgoing.get(target, ()))))
+
+    return cycle_node, reachable
+
+
+def _cycle_error(node_id: str) -> str:
+    return f"Cycle detected involving node {node_id}"
+
+
+def _source_count_errors(sources: List[GraphNode]) -> List[str]:
+    """Errors when there is not exactly one source node."""
+    if len(sources) == 0:
+        return ["Graph must have exactly one source node (CameraSource, VideoFileSource, or ImageFileSource)"]
+    if len(sources) > 1:
+        return [f"Graph must have exactly one source; found {len(sources)}: {[s.id for s in sources]}"]
+    return []
+
+
+def _unreachable_errors(node_ids: Set[str], reachable: Set[str]) -> List[str]:
+    unreachable = node_ids - reachable
+    if unreachable:
+        return [f"Unreachable nodes from source: {unreachable}"]
+    return []
+
+
+def validate_dag(
+    graph: PipelineGraph, outgoing: Optional[Dict[str, List[str]]] = None
+) -> Tuple[bool, List[str]]:
     """
     Validate that the graph is a DAG (no cycles).
+    outgoing: adjacency from graph._outgoing(), if the caller already has it.
     Returns (valid, list of error messages).
     """
-    errors: List[str] = []
     node_ids = {n.id for n in graph.nodes}
-    outgoing = graph._outgoing()
-
-    # DFS to detect cycles
-    WHITE, GRAY, BLACK = 0, 1, 2
-    color: Dict[str, int] = {nid: WHITE for nid in node_ids}
-    path: List[str] = []
-
-    def dfs(nid: str) -> bool:
-        if color[nid] == GRAY:
-            errors.append(f"Cycle detected involving node {nid}")
-            return False
-        if color[nid] == BLACK:
-            return True
-        color[nid] = GRAY
-        path.append(nid)
-        for target in outgoing.get(nid, []):
-            if target in node_ids and not dfs(target):
-                return False
-        path.pop()
-        color[nid] = BLACK
-        return True
-
-    for nid in node_ids:
-        if color[nid] == WHITE and not dfs(nid):
-            return False, errors
+    if outgoing is None:
+        outgoing = graph._outgoing()
 
+    cycle_node, _ = _walk_dag(node_ids, outgoing)
+    if cycle_node is not None:
+        return False, [_cycle_error(cycle_node)]
     return True, []
 
 
-def validate_single_source(graph: PipelineGraph) -> Tuple[bool, List[str]]:
+def validate_single_source(
+    graph: PipelineGraph, outgoing: Optional[Dict[str, List[str]]] = None
+) -> Tuple[bool, List[str]]:
     """
     Validate single-source: exactly one source, all nodes reachable from it.
+    outgoing: adjacency from graph._outgoing(), if the caller already has it.
     Returns (valid, list of error messages).
     """
-    errors: List[str] = []
     sources = graph.get_sources()
-
-    if len(sources) == 0:
-        errors.append("Graph must have exactly one source node (CameraSource, VideoFileSource, or ImageFileSource)")
-        return False, errors
-    if len(sources) > 1:
-        errors.append(f"Graph must have exactly one source; found {len(sources)}: {[s.id for s in sources]}")
+    errors = _source_count_errors(sources)
+    if errors:
         return False, errors
 
     # BFS from source to check reachability
     node_ids = {n.id for n in graph.nodes}
-    outgoing = graph._outgoing()
-    reachable: Set[str] = set()
-    queue = [sources[0].id]
+    if outgoing is None:
+        outgoing = graph._outgoing()
+    # Nodes are marked on enqueue, so each is queued at most once
+    reachable: Set[str] = {sources[0].id}
+    queue = deque(reachable)
     while queue:
-        nid = queue.pop(0)
-        if nid in reachable:
-            continue
-        reachable.add(nid)
+        nid = queue.popleft()
         for target in outgoing.get(nid, []):
             if target in node_ids and target not in reachable:
+                reachable.add(target)
                 queue.append(target)
 
-    unreachable = node_ids - reachable
-    if unreachable:
-        errors.append(f"Unreachable nodes from source: {unreachable}")
-        return False, errors
-
-    return True, []
+    errors = _unreachable_errors(node_ids, reachable)
+    return (len(errors) == 0, errors)
 
 
 def validate_single_input_per_port(graph: PipelineGraph) -> Tuple[bool, List[str]]:
@@ -157,16 +263,13 @@ def validate_single_input_per_port(graph: PipelineGraph) -> Tuple[bool, List[str
     Validate that each input port has at most one incoming edge.
     Returns (valid, list of error messages).
     """
-    errors: List[str] = []
-    port_inputs: Dict[Tuple[str, str], int] = {}  # (node_id, port) -> count
-
-    for e in graph.edges:
-        key = (e.target_node, e.target_port)
-        port_inputs[key] = port_inputs.get(key, 0) + 1
-
-    for (node_id, port), count in port_inputs.items():
-        if count > 1:
-            errors.append(f"Node {node_id} input port '{port}' has {count} inputs (max 1)")
+    # (node_id, port) -> count
+    port_inputs = Counter((e.target_node, e.target_port) for e in graph.edges)
+    errors = [
+        f"Node {node_id} input port '{port}' has {count} inputs (max 1)"
+        for (node_id, port), count in port_inputs.items()
+        if count > 1
+    ]
     return (len(errors) == 0, errors)
 
 
@@ -176,14 +279,16 @@ def validate_graph(graph: PipelineGraph) -> None:
     Raises GraphValidationError if invalid.
     """
     all_errors: List[str] = []
+    node_ids = {n.id for n in graph.nodes}
+    outgoing = graph._outgoing()
+    sources = graph.get_sources()
+    source_errors = _source_count_errors(sources)
 
-    ok, errs = validate_dag(graph)
-    if not ok:
-        all_errors.extend(errs)
-
-    ok, errs = validate_single_source(graph)
-    if not ok:
-        all_errors.extend(errs)
+    # One DFS serves the DAG check and, from the single source, the reachability check
+    cycle_node, reachable = _walk_dag(node_ids, outgoing, None if source_errors else sources[0].id)
+    if cycle_node is not None:
+        all_errors.append(_cycle_error(cycle_node))
+    all_errors.extend(source_errors or _unreachable_errors(node_ids, reachable))
 
     ok, errs = validate_single_input_per_port(graph)
     if not ok:
@@ -38,6 +38,19 @@ def _resolve_save_path(config: Dict[str, Any], default_ext: str) -> str:
     return os.path.join(DEFAULT_SAVE_DIR, name)
 
 
+# Preprocess adapter settings with their defaults; the adapter always gets every key
+_PREPROCESS_DEFAULTS: Dict[str, Any] = {
+    "blur_kernel_size": 3, "adaptive_block_size": 15, "adaptive_c": 3,
+    "threshold_type": "adaptive", "adaptive_thresholding": False, "contrast_normalization": False,
+    "binary_threshold": 127, "morphology": False, "morph_kernel_size": 3,
+}
+
+
+def _preprocess_config(config: Dict[str, Any]) -> Dict[str, Any]:
+    """Preprocess adapter config: node values where set, _PREPROCESS_DEFAULTS otherwise."""
+    return {key: config.get(key, default) for key, default in _PREPROCESS_DEFAULTS.items()}
+
+
 # Map stage_id → stage name (used by _PreprocessStage, _DetectStage, etc.)
 STAGE_ID_TO_NAME = {
     "preprocess_cpu": "preprocess",
@@ -75,13 +88,15 @@ def build_pipeline_with_taps(
     from ..adapters.apriltag_detector_adapter import AprilTagDetectorAdapter
     from .vision_pipeline import _PreprocessStage, _DetectStage, _OverlayStage
 
-    node_by_id = {n.get("id", ""): n for n in nodes}
+    # compile_graph() already indexed the nodes; hand-built plans fall back to indexing here
+    node_by_id = plan.node_index or {n.get("id", ""): n for n in nodes}
     node_configs = plan.node_configs or {}
     stages: List[PipelineStagePort] = []
     node_id_to_stage_name: Dict[str, str] = {}
 
-    preprocessor_cpu = PreprocessAdapter(logger)
-    preprocessor_gpu = GpuPreprocessAdapter(logger)
+    # Created on first use: most graphs need only one of them
+    preprocessor_cpu: Optional[PreprocessAdapter] = None
+    preprocessor_gpu: Optional[GpuPreprocessAdapter] = None
     tag_family = "tag36h11"
     for node in nodes:
         if node.get("stage_id") == "detect_apriltag_cpu":
@@ -109,48 +124,24 @@ def build_pipeline_with_taps(
             config = dict(raw_config)
         else:
             config = dict(node_configs.get(node_id, {}))
-        # Ensure defaults for preprocess so adapter always gets all keys
+        # Preprocess adapter gets every key, with defaults for any the node left unset
         if stage_id in ("preprocess_cpu", "preprocess_gpu"):
-            _preprocess_defaults = {
-                "blur_kernel_size": 3, "adaptive_block_size": 15, "adaptive_c": 3,
-                "threshold_type": "adaptive", "adaptive_thresholding": False, "contrast_normalization": False,
-                "binary_threshold": 127, "morphology": False, "morph_kernel_size": 3,
-            }
-            for k, v in _preprocess_defaults.items():
-                if k not in config:
-                    config[k] = v
+            preprocess_config = _preprocess_config(config)
             logger.info(
                 f"[PipelineBuilder] Preprocess {stage_id} node_id={node_id}: "
-                f"blur={config.get('blur_kernel_size')} adaptive_thr={config.get('adaptive_thresholding')} "
-                f"contrast_norm={config.get('contrast_normalization')} morph={config.get('morphology')}"
+                f"blur={preprocess_config['blur_kernel_size']} adaptive_thr={preprocess_config['adaptive_thresholding']} "
+                f"contrast_norm={preprocess_config['contrast_normalization']} morph={preprocess_config['morphology']}"
             )
-        stage_name = STAGE_ID_TO_NAME.get(stage_id)
         if stage_id == "preprocess_cpu":
-            preprocessor_cpu.set_config({
-                "blur_kernel_size": config.get("blur_kernel_size", 3),
-                "adaptive_block_size": config.get("adaptive_block_size", 15),
-                "adaptive_c": config.get("adaptive_c", 3),
-                "threshold_type": config.get("threshold_type", "adaptive"),
-                "adaptive_thresholding": config.get("adaptive_thresholding", False),
-                "contrast_normalization": config.get("contrast_normalization", False),
-                "binary_threshold": config.get("binary_threshold", 127),
-                "morphology": config.get("morphology", False),
-                "morph_kernel_size": config.get("morph_kernel_size", 3),
-            })
+            if preprocessor_cpu is None:
+                preprocessor_cpu = PreprocessAdapter(logger)
+            preprocessor_cpu.set_config(preprocess_config)
             stages.append(_PreprocessStage(preprocessor_cpu))
             node_id_to_stage_name[node_id] = "preprocess"
         elif stage_id == "preprocess_gpu":
-            preprocessor_gpu.set_config({
-                "blur_kernel_size": config.get("blur_kernel_size", 3),
-                "adaptive_block_size": config.get("adaptive_block_size", 15),
-                "adaptive_c": config.get("adaptive_c", 3),
-                "threshold_type": config.get("threshold_type", "adaptive"),
-                "adaptive_thresholding": config.get("adaptive_thresholding", False),
-                "contrast_normalization": config.get("contrast_normalization", False),
-                "binary_threshold": config.get("binary_threshold", 127),
-                "morphology": config.get("morphology", False),
-                "morph_kernel_size": config.get("morph_kernel_size", 3),
-            })
+            if preprocessor_gpu is None:
+                preprocessor_gpu = GpuPreprocessAdapter(logger)
+            preprocessor_gpu.set_config(preprocess_config)
             stages.append(_PreprocessStage(preprocessor_gpu))
             node_id_to_stage_name[node_id] = "preprocess"
         elif stage_id == "detect_apriltag_cpu":
@@ -29,6 +29,8 @@ class ExecutionPlan:
     main_path: List[str]  # ordered node_ids from source to SVTVisionOutput
     side_taps: List[SideTap] = field(default_factory=list)
     node_configs: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    # Raw node dicts passed to compile_graph, by id (for pipeline_builder; not serialized)
+    node_index: Dict[str, Dict[str, Any]] = field(default_factory=dict)
 
     def to_dict(self) -> Dict[str, Any]:
         return {
@@ -77,38 +79,38 @@ def _find_svt_output(graph: PipelineGraph) -> Optional[GraphNode]:
     return None
 
 
-def _find_path_dfs(
-    graph: PipelineGraph,
-    start: str,
-    target: str,
-    outgoing: Dict[str, List[tuple]],
-    visited: Set[str],
-    path: List[str],
-) -> Optional[List[str]]:
-    """DFS to find path from start to target. Returns path if found."""
-    if start == target:
-        return path + [start]
-    if start in visited:
-        return None
-    visited.add(start)
-    for (nxt, _, _) in outgoing.get(start, []):
-        result = _find_path_dfs(graph, nxt, target, outgoing, visited.copy(), path + [start])
-        if result is not None:
-            return result
-    return None
+def _path_tree(outgoing: Dict[str, List[tuple]], start: str) -> Dict[str, Optional[str]]:
+    """
+    One iterative DFS from start: node_id -> parent on the first path found to it (start -> None).
+    Keys are the nodes reachable from start. Visiting children in edge order, the first path found to
+    a node is the one a separate DFS per target would return, so this single walk serves every target.
+    """
+    parents: Dict[str, Optional[str]] = {start: None}
+    stack = [(start, iter(outgoing.get(start, ())))]
+    while stack:
+        node, children = stack[-1]
+        edge = next(children, None)
+        if edge is None:
+            stack.pop()
+            continue
+        nxt = edge[0]
+        if nxt not in parents:
+            parents[nxt] = node
+            stack.append((nxt, iter(outgoing.get(nxt, ()))))
+    return parents
 
 
-def _nodes_reachable_from(outgoing: Dict[str, List[tuple]], start: str) -> Set[str]:
-    """BFS: set of node ids reachable from start."""
-    reachable: Set[str] = {start}
-    queue: List[str] = [start]
-    while queue:
-        node = queue.pop(0)
-        for (nxt, _, _) in outgoing.get(node, []):
-            if nxt not in reachable:
-                reachable.add(nxt)
-                queue.append(nxt)
-    return reachable
+def _path_to(parents: Dict[str, Optional[str]], target: str) -> Optional[List[str]]:
+    """Path from the _path_tree start to target, or None if target is not reachable."""
+    if target not in parents:
+        return None
+    path: List[str] = []
+    node: Optional[str] = target
+    while node is not None:
+        path.append(node)
+        node = parents[node]
+    path.reverse()
+    return path
 
 
 def compile_graph(
@@ -159,10 +161,12 @@ def compile_graph(
 
     svt_sink = _find_svt_output(graph)
     outgoing = _outgoing_edges(graph)
+    # Paths from the source to every reachable node, from one walk shared by both branches below
+    parents = _path_tree(outgoing, source.id)
 
     if svt_sink is not None:
         # 3a. Main path: source → ... → SVTVisionOutput
-        path = _find_path_dfs(graph, source.id, svt_sink.id, outgoing, set(), [])
+        path = _path_to(parents, svt_sink.id)
         if path is None:
             raise GraphValidationError(
                 "No path from source to SVTVisionOutput",
@@ -171,10 +175,9 @@ def compile_graph(
         main_path = path
     else:
         # 3b. No SVTVisionOutput: allow graph if source (possibly via stages) feeds a side tap (e.g. CameraSource → Preprocess → StreamTap)
-        reachable = _nodes_reachable_from(outgoing, source.id)
         side_tap_edges = [
             e for e in graph.edges
-            if e.source_node in reachable
+            if e.source_node in parents
             and graph.get_node(e.target_node) is not None
             and getattr(graph.get_node(e.target_node), "sink_type", None) in SIDE_TAP_SINK_TYPES
         ]
@@ -187,7 +190,7 @@ def compile_graph(
         attach_points = {e.source_node for e in side_tap_edges}
         best_path: List[str] = [source.id]
         for ap in attach_points:
-            p = _find_path_dfs(graph, source.id, ap, outgoing, set(), [])
+            p = _path_to(parents, ap)
             if p is not None and len(p) > len(best_path):
                 best_path = p
         main_path = best_path
@@ -224,4 +227,5 @@ def compile_graph(
         main_path=main_path,
         side_taps=side_taps,
         node_configs=node_configs,
+        node_index={n.get("id", ""): n for n in nodes},
     )
@@ -51,14 +51,24 @@ class CameraPort(ABC):
         pass
     
     @abstractmethod
-    def capture_frame_raw(self) -> Optional[np.ndarray]:
+    def capture_frame_raw(self, out: Optional[np.ndarray] = None) -> Optional[np.ndarray]:
         """Capture a single raw frame.
         
+        Args:
+            out: Optional preallocated buffer to decode into (used when shape/dtype match)
+        
         Returns:
             Raw frame data as numpy array (BGR format), or None if capture failed
         """
         pass
     
+    def is_raw_grey(self) -> bool:
+        """Check if raw frames are single-channel Y8 read without conversion.
+        
+        capture_frame_raw() then ignores its out buffer. Defaults to False.
+        """
+        return False
+    
     @abstractmethod
     def get_actual_settings(self) -> dict:
         """Get actual camera settings.
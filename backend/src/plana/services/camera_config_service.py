@@ -1,8 +1,9 @@
 """Camera configuration service for SVTVision."""
 
+import copy
 import json
 from pathlib import Path
-from typing import Dict, Optional, Any
+from typing import Dict, Optional, Any, Tuple
 from .logging_service import LoggingService
 
 
@@ -20,6 +21,9 @@ class CameraConfigService:
         self.cameras_dir = config_dir / "cameras"  # Directory for per-camera settings
         self.cameras_dir.mkdir(parents=True, exist_ok=True)
         self.camera_names: Dict[str, Dict[str, str]] = {}
+        # Parsed per-camera settings keyed by camera_id: (file mtime_ns, settings); reread when the file changes.
+        # Callers get deep copies, so changing a returned (nested) dict never reaches the cache.
+        self._settings_cache: Dict[str, Tuple[int, Dict[str, Any]]] = {}
         self._load_names_config()
     
     def _load_names_config(self):
@@ -62,16 +66,23 @@ class CameraConfigService:
     def _load_camera_settings(self, camera_id: str) -> Dict[str, Any]:
         """Load settings for a specific camera from its settings file."""
         settings_file = self._get_camera_settings_file(camera_id)
-        if settings_file.exists():
-            try:
-                with open(settings_file, 'r') as f:
-                    settings = json.load(f)
-                self.logger.debug(f"[CameraConfig] Loaded settings for camera {camera_id} from {settings_file}")
-                return settings
-            except Exception as e:
-                self.logger.error(f"[CameraConfig] Failed to load settings for camera {camera_id}: {e}")
-                return {}
-        return {}
+        try:
+            mtime_ns = settings_file.stat().st_mtime_ns
+        except OSError:
+            self._settings_cache.pop(camera_id, None)
+            return {}
+        cached = self._settings_cache.get(camera_id)
+        if cached is not None and cached[0] == mtime_ns:
+            return copy.deepcopy(cached[1])
+        try:
+            with open(settings_file, 'r') as f:
+                settings = json.load(f)
+            self._settings_cache[camera_id] = (mtime_ns, settings)
+            self.logger.debug(f"[CameraConfig] Loaded settings for camera {camera_id} from {settings_file}")
+            return copy.deepcopy(settings)
+        except Exception as e:
+            self.logger.error(f"[CameraConfig] Failed to load settings for camera {camera_id}: {e}")
+            return {}
     
     def _save_camera_settings(self, camera_id: str, settings: Dict[str, Any]) -> None:
         """Save settings for a specific camera to its settings file."""
@@ -79,6 +90,8 @@ class CameraConfigService:
         try:
             with open(settings_file, 'w') as f:
                 json.dump(settings, f, indent=2)
+            # Drop the cached copy; the next load rereads the file (mtime may not tick within a write burst)
+            self._settings_cache.pop(camera_id, None)
             self.logger.debug(f"[CameraConfig] Saved settings for camera {camera_id} to {settings_file}")
         except Exception as e:
             self.logger.error(f"[CameraConfig] Failed to save settings for camera {camera_id}: {e}")
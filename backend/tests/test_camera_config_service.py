@@ -0,0 +1,31 @@
+"""Unit tests for CameraConfigService settings caching."""
+
+import pytest
+import tempfile
+from pathlib import Path
+import sys
+backend_src = Path(__file__).resolve().parent.parent / "src"
+sys.path.insert(0, str(backend_src))
+
+from plana.services.camera_config_service import CameraConfigService
+from plana.services.logging_service import LoggingService
+
+
+@pytest.fixture
+def tmp_config():
+    with tempfile.TemporaryDirectory() as d:
+        yield Path(d)
+
+
+def test_returned_nested_settings_do_not_alias_cache(tmp_config):
+    service = CameraConfigService(tmp_config, LoggingService())
+    service.set_camera_resolution_fps("cam1", "MJPG", 1280, 720, 30.0)
+
+    resolution = service.get_camera_resolution_fps("cam1")
+    resolution["width"] = 640
+    settings = service.get_camera_settings("cam1")
+    settings["resolution"]["height"] = 480
+
+    assert service.get_camera_resolution_fps("cam1") == {
+        "format": "MJPG", "width": 1280, "height": 720, "fps": 30.0
+    }
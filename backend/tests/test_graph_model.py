@@ -145,3 +145,86 @@ def test_validate_graph_invalid_raises():
     with pytest.raises(GraphValidationError) as exc_info:
         validate_graph(g)
     assert len(exc_info.value.errors) > 0
+
+
+def test_node_lookups_follow_node_list_changes():
+    """get_node/get_sources/get_sinks reflect nodes assigned after the first lookup."""
+    g = _make_graph([("n1", "source"), ("n2", "stage")], [("e1", "n1", "out", "n2", "in")])
+    assert g.get_node("n2").type == "stage"
+    assert g.get_node("n3") is None
+    assert g.get_sinks() == []
+
+    g.nodes = [*g.nodes, GraphNode(id="n3", type="sink")]
+    assert g.get_node("n3").type == "sink"
+    assert [n.id for n in g.get_sinks()] == ["n3"]
+
+    g.nodes = [GraphNode(id="s", type="source")]
+    assert g.get_node("n1") is None
+    assert [n.id for n in g.get_sources()] == ["s"]
+
+    # Same-length replacement
+    g.nodes = [GraphNode(id="s2", type="source")]
+    assert g.get_node("s") is None
+    assert [n.id for n in g.get_sources()] == ["s2"]
+
+
+def test_graph_sequences_are_immutable():
+    """nodes/edges are stored as tuples, so they cannot change behind the cached indexes."""
+    g = _make_graph([("n1", "source"), ("n2", "sink")], [("e1", "n1", "out", "n2", "in")])
+    assert isinstance(g.nodes, tuple) and isinstance(g.edges, tuple)
+    with pytest.raises(TypeError):
+        g.nodes[0] = GraphNode(id="x", type="source")
+    g.edges = []
+    assert g.edges == ()
+
+
+def test_adjacency_follows_edge_list_changes():
+    """Memoized adjacency picks up assigned edges; invalidate() covers in-place edits."""
+    g = _make_graph(
+        [("n1", "source"), ("n2", "stage"), ("n3", "sink")],
+        [("e1", "n1", "out", "n2", "in")],
+    )
+    ok, errs = validate_single_source(g)
+    assert ok is False
+
+    g.edges = [*g.edges, GraphEdge(id="e2", source_node="n2", source_port="out", target_node="n3", target_port="in")]
+    validate_graph(g)  # no exception
+
+    g.edges[1].source_node = "n3"
+    g.edges[1].target_node = "n2"
+    g.invalidate()
+    ok, errs = validate_single_source(g)
+    assert ok is False
+
+
+def test_deep_chain_validates_without_recursion_limit():
+    """A linear pipeline deeper than the interpreter recursion limit still validates."""
+    depth = 3000
+    nodes = [("n0", "source")] + [(f"n{i}", "stage") for i in range(1, depth)]
+    edges = [(f"e{i}", f"n{i - 1}", "out", f"n{i}", "in") for i in range(1, depth)]
+    g = _make_graph(nodes, edges)
+    ok, errs = validate_dag(g)
+    assert ok is True
+
+    g.edges = [*g.edges, GraphEdge(id="back", source_node=f"n{depth - 1}", source_port="out", target_node="n1", target_port="in")]
+    ok, errs = validate_dag(g)
+    assert ok is False
+    assert "cycle" in errs[0].lower()
+
+
+def test_validate_graph_reports_cycle_and_unreachable_together():
+    """A cycle reachable from the source and a disconnected node are both reported."""
+    g = _make_graph(
+        [("n1", "source"), ("n2", "stage"), ("n3", "stage"), ("n4", "sink")],
+        [
+            ("e1", "n1", "out", "n2", "in"),
+            ("e2", "n2", "out", "n3", "in"),
+            ("e3", "n3", "out", "n2", "aux"),
+        ],
+    )
+    with pytest.raises(GraphValidationError) as exc_info:
+        validate_graph(g)
+    errors = exc_info.value.errors
+    assert len(errors) == 2
+    assert "cycle" in errors[0].lower()
+    assert "unreachable" in errors[1].lower() and "n4" in errors[1]
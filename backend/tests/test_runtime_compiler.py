@@ -167,3 +167,17 @@ def test_compile_plan_to_dict():
     assert d["side_taps"][0]["node_id"] == "n5"
     assert d["side_taps"][0]["attach_point"] == "n2"
     assert d["node_configs"]["n2"]["blur_kernel_size"] == 5
+
+
+def test_compile_plan_indexes_raw_nodes():
+    """compile_graph keeps the raw node dicts by id for the builder; to_dict leaves them out."""
+    nodes = [
+        _node("n1", "source", source_type="camera"),
+        _node("n2", "stage", stage_id="preprocess_cpu", config={"blur_kernel_size": 5}),
+        _node("n3", "sink", sink_type="svt_output"),
+    ]
+    edges = [_edge("e1", "n1", "n2"), _edge("e2", "n2", "n3")]
+    plan = compile_graph(nodes, edges)
+    assert plan.node_index["n2"] is nodes[1]
+    assert set(plan.node_index) == {"n1", "n2", "n3"}
+    assert "node_index" not in plan.to_dict()